@@ -0,0 +1,142 @@
+"""
+ETRI 응답 파싱 마이크로벤치마크 (네트워크 호출 없음)
+
+기존 방식: response.json() → 전체 응답 json.dumps(indent=2) 출력 → dict 기반 SRL/dependency 탐색
+새 방식:   etri_parser.parse_etri_response(bytes) → __slots__ 레코드 → analyze_etri_response
+
+실행: python ai-engine/benchmarks/bench_etri_parser.py [--sentences 5] [--number 2000]
+"""
+import io
+import os
+import sys
+import json
+import timeit
+import argparse
+import tracemalloc
+import contextlib
+
+# ai-engine 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from preprocessing import etri_parser
+from preprocessing.etri_parser import parse_etri_response
+from preprocessing.svo_extractor_ko import analyze_etri_response
+
+TEXT = "학생이 도서관에서 어려운 책을 열심히 읽는다"
+
+
+def make_sentence(index: int):
+    """ETRI srl 응답의 문장 하나와 비슷한 크기/구조의 dict (morp, WSD, NE 등 사용하지 않는 필드 포함)"""
+    words = TEXT.split()
+    morps = []
+    for i, word in enumerate(words):
+        morps.append({"id": i * 2, "lemma": word[:-1] or word, "type": "NNG", "position": i * 12, "weight": 0.9})
+        morps.append({"id": i * 2 + 1, "lemma": word[-1], "type": "JKS", "position": i * 12 + 9, "weight": 0.1})
+    return {
+        "id": index,
+        "reserve_str": "",
+        "text": TEXT,
+        "morp": morps,
+        "morp_eval": [{"id": i, "result": m["lemma"], "target": m["lemma"], "word_id": i // 2, "m_begin": i, "m_end": i} for i, m in enumerate(morps)],
+        "WSD": [{"id": i, "text": m["lemma"], "type": m["type"], "scode": "01", "weight": 1.0, "position": m["position"], "begin": i, "end": i} for i, m in enumerate(morps)],
+        "word": [{"id": i, "text": w, "type": "", "begin": i * 2, "end": i * 2 + 1} for i, w in enumerate(words)],
+        "NE": [{"id": 0, "text": "도서관", "type": "AF_BUILDING", "begin": 2, "end": 2, "weight": 0.5, "common_noun": 0}],
+        "chunk": [],
+        "dependency": [
+            {"id": i, "text": w, "head": len(words) - 1, "label": "NP_SBJ" if i == 0 else ("VNP" if i == len(words) - 1 else "NP_AJT"),
+             "mod": [], "weight": 0.8}
+            for i, w in enumerate(words)
+        ],
+        "phrase_dependency": [],
+        "SRL": [{
+            "verb": "읽",
+            "sense": 1,
+            "word_id": len(words) - 1,
+            "weight": 0.7,
+            "argument": [
+                {"type": "ARG0", "word_id": 0, "text": words[0], "weight": 0.6},
+                {"type": "ARGM-LOC", "word_id": 1, "text": words[1], "weight": 0.5},
+                {"type": "ARG1", "word_id": 3, "text": words[3], "weight": 0.6},
+            ]
+        }],
+        "relation": [],
+        "SA": [],
+        "ZA": []
+    }
+
+
+def make_payload(sentence_count: int) -> bytes:
+    data = {"result": 0, "return_type": "com.google.gson.internal.LinkedTreeMap",
+            "return_object": {"doc_id": "", "DCT": "", "category": "", "title": "",
+                              "sentence": [make_sentence(i) for i in range(sentence_count)], "entity": []}}
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def baseline(content: bytes):
+    """svo_extractor_ko.py의 이전 처리 방식 그대로"""
+    data = json.loads(content)
+    with contextlib.redirect_stdout(io.StringIO()):
+        print(f"API Response: {json.dumps(data, indent=2, ensure_ascii=False)}")  # 전체 응답 출력
+    sentences = data.get("return_object", {}).get("sentence", [])
+    svo_list = []
+    for sentence in sentences:
+        for srl in sentence.get("SRL", []):
+            verb = srl.get("verb", "")
+            subject = None
+            obj = None
+            for arg in srl.get("argument", []):
+                arg_type = arg.get("type", "")
+                arg_text = arg.get("text", "")
+                if arg_type == "ARG0":
+                    subject = arg_text
+                elif arg_type in ["ARG1", "ARG2"]:
+                    obj = arg_text
+            if subject and verb and obj:
+                svo_list.append({"S": subject, "V": verb, "O": obj})
+    first_svo = svo_list[0]
+    return {"sentence": TEXT, "language": "ko",
+            "svo": {"subject": first_svo["S"], "verb": first_svo["V"], "object": first_svo["O"]}}
+
+
+def compact(content: bytes):
+    return analyze_etri_response(TEXT, parse_etri_response(content))
+
+
+def measure(fn, content: bytes, number: int):
+    seconds = min(timeit.repeat(lambda: fn(content), number=number, repeat=3)) / number
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ETRI 응답 파싱 마이크로벤치마크")
+    parser.add_argument("--sentences", type=int, default=5, help="응답 하나에 든 문장 수")
+    parser.add_argument("--number", type=int, default=2000, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    content = make_payload(args.sentences)
+    assert baseline(content)["svo"] == compact(content)["svo"]
+
+    cases = [("baseline (json + dump + dict walk)", baseline), ("etri_parser", compact)]
+    if etri_parser.orjson is not None:
+        def compact_stdlib(content):
+            saved = etri_parser.orjson
+            etri_parser.orjson = None
+            try:
+                return compact(content)
+            finally:
+                etri_parser.orjson = saved
+        cases.append(("etri_parser (json, orjson 없이)", compact_stdlib))
+
+    print(f"payload: {len(content) / 1024:.1f}KB, 문장 {args.sentences}개, 반복 {args.number}회")
+    base_seconds = None
+    for name, fn in cases:
+        seconds, peak = measure(fn, content, args.number)
+        base_seconds = base_seconds or seconds
+        print(f"{name:<36} {seconds * 1e6:9.1f} us/op  {base_seconds / seconds:5.1f}x  peak {peak / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+전처리 핫 경로 마이크로벤치마크 + 성능 회귀 검사 (네트워크 호출 없음)
+
+대상: split_sentences, to_structured_json, extract_svo_en(spaCy 파싱/캐시 hit), extract_svo_rules,
+      ETRI 응답 처리(parse_etri_response → analyze_etri_response / demux_etri_response)
+코퍼스: 짧은/긴 한국어, 영어, 한국어·영어·목록이 섞인 GPT 답변 (시드 고정으로 생성)
+
+호출당 처리량(ops/s)과 한 번 호출할 때의 최대 메모리 할당량을 측정하고, 저장된 기준값보다
+허용 비율 이상 나빠진 항목이 있으면 종료 코드 1을 반환합니다.
+처리량은 기계마다 다르므로 항목마다 번갈아 잰 순수 파이썬 보정 작업 대비 비율로 비교합니다.
+
+실행:
+    python ai-engine/benchmarks/bench_preprocessing.py                    # 기준값과 비교
+    python ai-engine/benchmarks/bench_preprocessing.py --update-baseline  # 기준값 갱신
+    python ai-engine/benchmarks/bench_preprocessing.py --only split --out /tmp/result.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import timeit
+import statistics
+import argparse
+import platform
+import tracemalloc
+
+# ai-engine 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from preprocessing.sentence_splitter import split_sentences, to_structured_json
+from preprocessing.svo_extractor_ko_rules import extract_svo_rules
+from preprocessing.etri_parser import parse_etri_response
+from preprocessing.svo_extractor_ko import analyze_etri_response, demux_etri_response
+from preprocessing import svo_extractor_en
+from preprocessing.model_manager import model_manager
+from bench_etri_parser import make_payload, TEXT as ETRI_TEXT
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline_preprocessing.json")
+# 호출 한 번이 이보다 짧은 항목(us)은 타이머/캐시 영향으로 흔들림이 커서 --micro-threshold로 비교
+MICRO_US_PER_OP = 10.0
+
+KO_FRAGMENTS = [
+    "세종대왕은 1443년에 훈민정음을 창제했습니다.",
+    "훈민정음은 백성을 가르치는 바른 소리라는 뜻이에요.",
+    "집현전 학자들이 연구를 도왔다고 알려져 있습니다.",
+    "당시 양반들은 \"한자를 두고 새 글자를 쓸 필요가 없다\"며 반대하기도 했어요.",
+    "이후 1446년에 반포되었고, 오늘날 한글날(10월 9일)로 기념합니다!",
+    "정말 대단한 업적이죠?",
+    "장영실은 측우기와 자격루를 만들었다.",
+    "조선의 수도는 한양이었으며 지금의 서울이다.",
+    "이 시기에 농사직설도 편찬되었습니다…",
+    "과학 기술도 크게 발전했어요.",
+]
+EN_FRAGMENTS = [
+    "King Sejong created the Korean alphabet in 1443.",
+    "The scholars of the Hall of Worthies helped him.",
+    "Many officials opposed the new script!",
+    "Why did he create it?",
+    "He wanted ordinary people to read and write easily.",
+    "The alphabet was officially proclaimed in 1446.",
+    "Today, Koreans celebrate Hangeul Day on October 9.",
+    "Jang Yeong-sil invented the rain gauge.",
+]
+KO_SHORT = ["학생이 책을 읽는다.", "세종대왕이 훈민정음을 창제했다.", "오늘 날씨가 정말 좋네요", "고양이를 개가 쫓는다."]
+EN_SHORT = ["King Sejong created the Korean alphabet.", "The book was read by Tom.",
+            "John and Mary eat an apple and a banana.", "The students read a history book."]
+
+
+def build_corpora(seed: int = 7):
+    """측정용 텍스트 (같은 시드면 항상 같은 내용)"""
+    rng = random.Random(seed)
+    ko_long = " ".join(rng.choice(KO_FRAGMENTS) for _ in range(40))
+    en_long = " ".join(rng.choice(EN_FRAGMENTS) for _ in range(40))
+    mixed_parts = ["네, 요약하면 다음과 같습니다.\n"]
+    for i in range(1, 13):
+        mixed_parts.append(f"{i}. {rng.choice(KO_FRAGMENTS)} ({rng.choice(EN_FRAGMENTS)})\n")
+    mixed_parts.append("버전 3.5 기준이며, 자세한 내용은 \"조선왕조실록\"을 참고하세요.")
+    return {
+        "ko_short": KO_SHORT[0],
+        "ko_long": ko_long,
+        "en_short": EN_SHORT[0],
+        "en_long": en_long,
+        "mixed": "".join(mixed_parts),
+    }
+
+
+def build_cases(corpora):
+    """(이름, 함수) 리스트. 함수는 인자 없이 한 번 호출하는 단위"""
+    cases = []
+    for name in ("ko_short", "ko_long", "en_long", "mixed"):
+        text = corpora[name]
+        cases.append((f"split_sentences:{name}", lambda text=text: split_sentences(text)))
+    for name in ("ko_long", "mixed"):
+        text = corpora[name]
+        cases.append((f"to_structured_json:{name}", lambda text=text: to_structured_json(text)))
+
+    cases.append(("extract_svo_rules:ko_short", lambda: [extract_svo_rules(s) for s in KO_SHORT]))
+
+    for count in (1, 10):
+        payload = make_payload(count)
+        cases.append((f"etri_walk:{count}_sentences",
+                      lambda payload=payload: analyze_etri_response(ETRI_TEXT, parse_etri_response(payload))))
+    batch_texts = [ETRI_TEXT] * 10
+    batch_payload = make_payload(10)
+    cases.append(("etri_demux:10_sentences",
+                  lambda: demux_etri_response(batch_texts, parse_etri_response(batch_payload))))
+
+    try:
+        nlp = svo_extractor_en.get_nlp()
+    except (OSError, ValueError) as e:
+        print(f"extract_svo_en 건너뜀 (spaCy 모델 로드 실패: {e})")
+        return cases
+    # 캐시 miss: 문장마다 spaCy 파싱 / 캐시 hit: parse_cache 조회 + 복사
+    cases.append(("extract_svo_en:parse",
+                  lambda: [svo_extractor_en._extract_svo_from_tokens(nlp(s)) for s in EN_SHORT]))
+    for s in EN_SHORT:
+        svo_extractor_en.extract_svo_en(s)
+    cases.append(("extract_svo_en:cached", lambda: [svo_extractor_en.extract_svo_en(s) for s in EN_SHORT]))
+    return cases
+
+
+def calibration():
+    """기계 속도 보정용 순수 파이썬 작업 (문자열/리스트/dict 위주)"""
+    words = [f"단어{i}" for i in range(200)]
+    counts = {}
+    for word in words:
+        counts[word[-1]] = counts.get(word[-1], 0) + len(word)
+    return " ".join(sorted(counts))
+
+
+def _number(fn, min_seconds: float) -> int:
+    """한 번 측정에 최소 min_seconds가 걸리는 반복 횟수"""
+    number, _ = timeit.Timer(fn).autorange()
+    return max(1, int(number * min_seconds / 0.2))
+
+
+def measure_ops(fn, min_seconds: float, repeat: int):
+    """
+    대상 함수와 보정 작업을 번갈아 repeat번 재고, 회차별 값의 중앙값으로 계산
+    (번갈아 재야 CPU 클럭 변화 등이 양쪽에 같이 반영됨, 가장 빠른 값 하나보다 튀는 회차의 영향이 적음)
+    반환: (대상 ops/s, 보정 ops/s, 보정 대비 비율)
+    """
+    timer, calib_timer = timeit.Timer(fn), timeit.Timer(calibration)
+    number, calib_number = _number(fn, min_seconds), _number(calibration, min_seconds)
+    ops, calib_ops, ratios = [], [], []
+    for _ in range(repeat):
+        ops.append(number / timer.timeit(number))
+        calib_ops.append(calib_number / calib_timer.timeit(calib_number))
+        ratios.append(ops[-1] / calib_ops[-1])
+    return statistics.median(ops), statistics.median(calib_ops), statistics.median(ratios)
+
+
+def measure_alloc(fn) -> int:
+    """한 번 호출할 때의 최대 할당 바이트 (tracemalloc peak, 이미 한 번 실행한 뒤 측정)"""
+    fn()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(cases, min_seconds: float, repeat: int):
+    results = {}
+    calib_samples = []
+    for name, fn in cases:
+        ops, calib_ops, relative_speed = measure_ops(fn, min_seconds, repeat)
+        calib_samples.append(calib_ops)
+        results[name] = {
+            "ops_per_sec": round(ops, 1),
+            "us_per_op": round(1e6 / ops, 2),
+            "relative_speed": round(relative_speed, 6),
+            "alloc_peak_bytes": measure_alloc(fn)
+        }
+        r = results[name]
+        print(f"{name:<32} {r['ops_per_sec']:>12.1f} ops/s {r['us_per_op']:>10.2f} us/op "
+              f"peak {r['alloc_peak_bytes'] / 1024:>8.1f}KB")
+    return max(calib_samples, default=0.0), results
+
+
+def compare(baseline: dict, current: dict, threshold: float, alloc_threshold: float, micro_threshold: float):
+    """
+    기준값보다 나빠진 항목 리스트 (처리량은 보정 비율, 할당량은 바이트로 비교)
+    호출당 MICRO_US_PER_OP보다 짧은 항목은 micro_threshold까지 허용
+    """
+    regressions = []
+    if baseline.get("meta", {}).get("spacy_model") != current["meta"]["spacy_model"]:
+        print("spaCy 모델이 기준값과 달라 extract_svo_en 항목은 비교하지 않습니다.")
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        if name.startswith("extract_svo_en") and baseline["meta"].get("spacy_model") != current["meta"]["spacy_model"]:
+            continue
+        speed_change = now["relative_speed"] / before["relative_speed"] - 1
+        limit = max(threshold, micro_threshold) if before["us_per_op"] < MICRO_US_PER_OP else threshold
+        # 작은 할당량은 측정 오차가 커서 1KB 여유를 둠
+        alloc_limit = before["alloc_peak_bytes"] * (1 + alloc_threshold) + 1024
+        status = "ok"
+        if speed_change < -limit:
+            status = "SLOWER"
+            regressions.append(f"{name}: 처리량 {speed_change * 100:+.1f}%")
+        if now["alloc_peak_bytes"] > alloc_limit:
+            status = "MORE ALLOC" if status == "ok" else status + ", MORE ALLOC"
+            regressions.append(f"{name}: 할당량 {before['alloc_peak_bytes']} → {now['alloc_peak_bytes']} bytes")
+        print(f"{name:<32} 처리량 {speed_change * 100:+7.1f}%  할당량 "
+              f"{before['alloc_peak_bytes'] / 1024:>8.1f} → {now['alloc_peak_bytes'] / 1024:>8.1f}KB  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 마이크로벤치마크 / 성능 회귀 검사")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="비교하지 않고 기준값을 새로 저장")
+    parser.add_argument("--threshold", type=float, default=0.3, help="허용 처리량 감소 비율 (기본 0.3 = 30%%)")
+    parser.add_argument("--micro-threshold", type=float, default=0.5,
+                        help=f"호출당 {MICRO_US_PER_OP:g}us 미만 항목의 허용 처리량 감소 비율 (기본 0.5)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.1, help="허용 할당량 증가 비율 (기본 0.1)")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="측정 1회의 최소 시간(초)")
+    parser.add_argument("--repeat", type=int, default=7, help="측정 횟수 (회차별 값의 중앙값 사용)")
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 측정")
+    parser.add_argument("--out", help="이번 결과 JSON 경로")
+    args = parser.parse_args()
+
+    cases = build_cases(build_corpora())
+    if args.only:
+        cases = [(name, fn) for name, fn in cases if args.only in name]
+    calib_ops, results = run(cases, args.min_seconds, args.repeat)
+    current = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spacy_model": model_manager.model_name("en") if any(n.startswith("extract_svo_en") for n in results) else None,
+            "calibration_ops_per_sec": round(calib_ops, 1)
+        },
+        "results": results
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        if args.only and os.path.exists(args.baseline):
+            # 일부 항목만 측정했으면 나머지 기준값은 유지
+            with open(args.baseline, encoding="utf-8") as f:
+                merged = json.load(f)
+            merged["results"].update(results)
+            current["results"] = merged["results"]
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"\n기준값 파일이 없습니다: {args.baseline} (--update-baseline으로 생성)")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n=== 기준값 비교 ({args.baseline}) ===")
+    regressions = compare(baseline, current, args.threshold, args.alloc_threshold, args.micro_threshold)
+    if regressions:
+        print("\n성능 회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\n성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
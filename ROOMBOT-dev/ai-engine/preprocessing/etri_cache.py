@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from dotenv import load_dotenv
+
+try:
+    from .lru_cache import LRUCache
+except ImportError:  # python 파일명.py로 단독 실행할 때
+    from lru_cache import LRUCache
+
+load_dotenv()
+
+# ETRI 분석 결과 캐시 설정
+ETRI_CACHE_ENABLED = os.getenv("ETRI_CACHE_ENABLED", "1") == "1"
+ETRI_CACHE_SIZE = int(os.getenv("ETRI_CACHE_SIZE", "4096"))
+ETRI_CACHE_TTL = float(os.getenv("ETRI_CACHE_TTL", "604800"))  # 초 (기본 7일)
+ETRI_CACHE_EMPTY_TTL = float(os.getenv("ETRI_CACHE_EMPTY_TTL", "3600"))  # 문장 정보가 없던 응답은 짧게 (기본 1시간)
+ETRI_CACHE_PATH = os.getenv("ETRI_CACHE_PATH") or None  # sqlite 파일 경로 (미설정 시 메모리만 사용)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 정규화(NFC) 후 공백을 하나로 합칩니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(analysis_code: str, text: str, parser_version: str) -> str:
+    # 구어체/문어체 엔드포인트는 같은 분석 결과를 주므로 키에 넣지 않음 (조회 1번, 미스도 1번으로 집계)
+    raw = json.dumps([analysis_code, parser_version, normalize_text(text)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EtriResultCache:
+    """
+    ETRI 분석 결과(SVO) 캐시 (키: analysis_code + 정규화된 문장 + 파서 버전)
+    - 메모리: LRU + TTL
+    - 디스크(선택): sqlite 파일, 재시작 후에도 같은 문장은 ETRI를 다시 호출하지 않음
+    - parser_version이 바뀌면 이전 버전으로 저장된 항목은 키가 달라지고, 디스크에서도 삭제됨
+    """
+
+    def __init__(self, parser_version: str, maxsize: int = ETRI_CACHE_SIZE, ttl: float = ETRI_CACHE_TTL,
+                 empty_ttl: float = ETRI_CACHE_EMPTY_TTL, path: str = None, enabled: bool = True):
+        self.parser_version = parser_version
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.path = path
+        self.enabled = enabled
+        self.disk_hits = 0
+        self.disk_errors = 0
+        self._conn = None
+        self._lock = threading.Lock()
+        if enabled and path:
+            self._open()
+
+    def _open(self):
+        try:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS etri_cache ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, analysis_code TEXT, text TEXT, "
+                "parser_version TEXT, result TEXT, expires_at REAL)"
+            )
+            # 파싱 로직이 바뀌었거나 만료된 항목 정리
+            conn.execute(
+                "DELETE FROM etri_cache WHERE parser_version != ? OR expires_at < ?",
+                (self.parser_version, time.time())
+            )
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"ETRI 캐시 파일 열기 실패 ({self.path}): {e}")
+            self.disk_errors += 1
+
+    def get(self, analysis_code: str, text: str):
+        """캐시된 결과를 반환합니다. 없으면 None."""
+        if not self.enabled:
+            return None
+        key = make_cache_key(analysis_code, text, self.parser_version)
+        result = self.memory.get(key)
+        if result is not None or self._conn is None:
+            return result
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result, expires_at FROM etri_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"ETRI 캐시 조회 오류: {e}")
+            self.disk_errors += 1
+            return None
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return None
+        result = json.loads(row[0])
+        self.memory.set(key, result, ttl=remaining)
+        self.disk_hits += 1
+        return result
+
+    def set(self, endpoint: str, analysis_code: str, text: str, result, empty: bool = False):
+        """결과를 저장합니다. empty=True(문장 정보가 없던 응답)이면 짧은 TTL 적용. (endpoint는 디스크에 기록만)"""
+        if not self.enabled:
+            return
+        key = make_cache_key(analysis_code, text, self.parser_version)
+        ttl = self.empty_ttl if empty else self.ttl
+        self.memory.set(key, result, ttl=ttl)
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO etri_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, analysis_code, normalize_text(text), self.parser_version,
+                     json.dumps(result, ensure_ascii=False), time.time() + ttl)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"ETRI 캐시 저장 오류: {e}")
+            self.disk_errors += 1
+
+    async def aget(self, analysis_code: str, text: str):
+        """get의 비동기 버전 (디스크 조회는 스레드에서)"""
+        if self._conn is None:
+            return self.get(analysis_code, text)
+        return await asyncio.to_thread(self.get, analysis_code, text)
+
+    async def aset(self, endpoint: str, analysis_code: str, text: str, result, empty: bool = False):
+        if self._conn is None:
+            return self.set(endpoint, analysis_code, text, result, empty)
+        await asyncio.to_thread(self.set, endpoint, analysis_code, text, result, empty)
+
+    def clear(self):
+        """메모리/디스크의 모든 항목을 지웁니다."""
+        self.memory.clear()
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM etri_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        disk_size = 0
+        if self._conn is not None:
+            try:
+                with self._lock:
+                    disk_size = self._conn.execute("SELECT COUNT(*) FROM etri_cache").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return {
+            "enabled": self.enabled,
+            "parser_version": self.parser_version,
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": self._conn is not None,
+                "size": disk_size,
+                "hits": self.disk_hits,
+                "errors": self.disk_errors
+            }
+        }
+
+
+def create_etri_cache(parser_version: str) -> EtriResultCache:
+    """환경변수 설정으로 EtriResultCache를 만듭니다."""
+    return EtriResultCache(
+        parser_version,
+        maxsize=ETRI_CACHE_SIZE,
+        ttl=ETRI_CACHE_TTL,
+        empty_ttl=ETRI_CACHE_EMPTY_TTL,
+        path=ETRI_CACHE_PATH,
+        enabled=ETRI_CACHE_ENABLED
+    )
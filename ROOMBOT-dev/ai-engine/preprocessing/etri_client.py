@@ -0,0 +1,136 @@
+import os
+import json
+import asyncio
+import random
+import threading
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 연결/응답 대기 시간(초), 재시도 횟수, 커넥션 풀 크기
+ETRI_CONNECT_TIMEOUT = float(os.getenv("ETRI_CONNECT_TIMEOUT", "3"))
+ETRI_READ_TIMEOUT = float(os.getenv("ETRI_READ_TIMEOUT", "15"))
+ETRI_MAX_RETRIES = int(os.getenv("ETRI_MAX_RETRIES", "2"))
+ETRI_BACKOFF = float(os.getenv("ETRI_BACKOFF", "0.3"))
+ETRI_POOL_SIZE = int(os.getenv("ETRI_POOL_SIZE", "16"))
+
+# 재시도할 HTTP 상태 코드 (일시적인 서버 오류/과부하)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def build_headers(api_key: str):
+    return {
+        "Content-Type": "application/json; charset=UTF-8",
+        "Authorization": api_key
+    }
+
+
+def build_payload(text: str, analysis_code: str):
+    return json.dumps({
+        "argument": {
+            "text": text,
+            "analysis_code": analysis_code
+        }
+    })
+
+
+class EtriClient:
+    """
+    ETRI WiseNLU 공용 HTTP 클라이언트
+    - 동기: requests.Session + 커넥션 풀(keep-alive), urllib3 Retry로 제한된 재시도
+    - 비동기: httpx.AsyncClient (같은 타임아웃/재시도 정책)
+    - 모든 호출에 connect/read 타임아웃 적용 (호출별로 timeout 인자로 변경 가능)
+    """
+
+    def __init__(self, connect_timeout: float = ETRI_CONNECT_TIMEOUT, read_timeout: float = ETRI_READ_TIMEOUT,
+                 max_retries: int = ETRI_MAX_RETRIES, pool_size: int = ETRI_POOL_SIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self._session = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    retry = Retry(
+                        total=self.max_retries,
+                        backoff_factor=ETRI_BACKOFF,
+                        status_forcelist=RETRY_STATUS,
+                        allowed_methods=frozenset(["POST"]),  # ETRI 분석 요청은 같은 입력이면 같은 결과
+                        raise_on_status=False
+                    )
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            )
+        return self._async_client
+
+    def post(self, url: str, text: str, analysis_code: str, api_key: str, timeout=None) -> requests.Response:
+        """ETRI API에 분석 요청을 보냅니다. (연결 재사용, 실패 시 제한된 재시도)"""
+        return self._get_session().post(
+            url,
+            headers=build_headers(api_key),
+            data=build_payload(text, analysis_code),
+            timeout=timeout or self.timeout
+        )
+
+    async def apost(self, url: str, text: str, analysis_code: str, api_key: str, timeout=None) -> httpx.Response:
+        """post의 비동기 버전"""
+        client = self._get_async_client()
+        if timeout is not None:
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            timeout = client.timeout
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.post(
+                    url,
+                    headers=build_headers(api_key),
+                    content=build_payload(text, analysis_code).encode("utf-8"),
+                    timeout=timeout
+                )
+                if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                    return response
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout, httpx.RemoteProtocolError):
+                if attempt == self.max_retries:
+                    raise
+            await asyncio.sleep(ETRI_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.0))
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+_client = None
+
+
+def get_etri_client() -> EtriClient:
+    """프로세스 전체에서 공유하는 EtriClient를 반환합니다."""
+    global _client
+    if _client is None:
+        _client = EtriClient()
+    return _client
@@ -0,0 +1,93 @@
+import os
+import json
+import random
+from dotenv import load_dotenv
+
+try:
+    import orjson  # 선택: 설치되어 있으면 더 빠른 JSON 디코더 사용
+except ImportError:
+    orjson = None
+
+load_dotenv()
+
+# 원본 ETRI 응답을 로그로 남길 비율 (0이면 남기지 않음, 1이면 전부)
+ETRI_DEBUG_DUMP_RATE = float(os.getenv("ETRI_DEBUG_DUMP_RATE", "0"))
+
+
+def loads(content):
+    """bytes/str JSON을 디코딩합니다. (orjson이 있으면 orjson)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def maybe_dump(label: str, content):
+    """ETRI_DEBUG_DUMP_RATE 비율로만 원본 응답을 출력합니다."""
+    if ETRI_DEBUG_DUMP_RATE <= 0 or random.random() >= ETRI_DEBUG_DUMP_RATE:
+        return
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    print(f"{label}: {content}")
+
+
+class ParsedSentence:
+    """ETRI 응답의 문장 하나에서 SVO 추출에 쓰는 필드만 담은 레코드"""
+
+    __slots__ = ("text", "triples", "subject", "predicate", "words")
+
+    def __init__(self, text: str, triples, subject: str, predicate: str, words):
+        self.text = text
+        self.triples = triples  # [(주어, 동사, 목적어)] (SRL → semantic_role 순)
+        self.subject = subject  # dependency NP_SBJ (마지막 것)
+        self.predicate = predicate  # dependency VNP (마지막 것)
+        self.words = words  # 어절 text 리스트
+
+
+def _arguments(frame):
+    # ARG0 → 주어, ARG1/ARG2 → 목적어 (뒤에 나온 것이 우선)
+    subject = None
+    obj = None
+    for arg in frame.get("argument", ()):
+        arg_type = arg.get("type")
+        if arg_type == "ARG0":
+            subject = arg.get("text")
+        elif arg_type == "ARG1" or arg_type == "ARG2":
+            obj = arg.get("text")
+    return subject, obj
+
+
+def parse_sentence(sentence: dict) -> ParsedSentence:
+    triples = []
+    for frame in sentence.get("SRL", ()):
+        verb = frame.get("verb", "")
+        subject, obj = _arguments(frame)
+        if subject and verb and obj:
+            triples.append((subject, verb, obj))
+    # 기존 semantic_role 필드 (하위 호환성)
+    for frame in sentence.get("semantic_role", ()):
+        verb = (frame.get("predicate") or {}).get("text", "")
+        subject, obj = _arguments(frame)
+        if subject and verb and obj:
+            triples.append((subject, verb, obj))
+
+    subject = ""
+    predicate = ""
+    for dep in sentence.get("dependency", ()):
+        label = dep.get("label")
+        if label == "NP_SBJ":
+            subject = dep.get("text", "")
+        elif label == "VNP":
+            predicate = dep.get("text", "")
+
+    words = [word["text"] for word in sentence.get("word", ()) if word.get("text")]
+    return ParsedSentence(sentence.get("text", ""), triples, subject, predicate, words)
+
+
+def parse_etri_response(content):
+    """
+    ETRI 응답 본문(bytes/str) 또는 디코딩된 dict에서 문장 레코드 리스트를 만듭니다.
+    morp/NE 등 사용하지 않는 필드는 읽지 않음
+    """
+    data = loads(content) if isinstance(content, (bytes, str)) else content
+    sentences = (data.get("return_object") or {}).get("sentence") or ()
+    return [parse_sentence(sentence) for sentence in sentences]
@@ -0,0 +1,111 @@
+import os
+import time
+import threading
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 최근 N회 호출 결과로 엔드포인트 상태를 판단, 밀린 엔드포인트는 일정 간격(초)마다 먼저 시도해 회복 여부 확인
+ETRI_ROUTER_WINDOW = int(os.getenv("ETRI_ROUTER_WINDOW", "50"))
+ETRI_ROUTER_MIN_SAMPLES = int(os.getenv("ETRI_ROUTER_MIN_SAMPLES", "5"))
+ETRI_ROUTER_PROBE_INTERVAL = float(os.getenv("ETRI_ROUTER_PROBE_INTERVAL", "60"))
+
+OUTCOME_OK = "ok"
+OUTCOME_EMPTY = "empty"
+OUTCOME_ERROR = "error"
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+class EndpointStats:
+    """엔드포인트 하나의 최근 호출 결과 (sliding window)"""
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.results = deque(maxlen=window)  # (outcome, 응답 시간(초))
+        self.total = 0
+        self.last_attempt = time.monotonic()
+
+    def record(self, outcome: str, latency: float):
+        self.results.append((outcome, latency))
+        self.total += 1
+        self.last_attempt = time.monotonic()
+
+    def rate(self, outcome: str) -> float:
+        if not self.results:
+            return 0.0
+        return sum(1 for o, _ in self.results if o == outcome) / len(self.results)
+
+    def latencies(self):
+        return [latency for _, latency in self.results]
+
+    def stats(self) -> dict:
+        latencies = self.latencies()
+        return {
+            "samples": len(self.results),
+            "total": self.total,
+            "success_rate": round(self.rate(OUTCOME_OK), 3),
+            "empty_rate": round(self.rate(OUTCOME_EMPTY), 3),
+            "error_rate": round(self.rate(OUTCOME_ERROR), 3),
+            "latency_p50_ms": round(_percentile(latencies, 0.5) * 1000, 1),
+            "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1)
+        }
+
+
+class EtriRouter:
+    """
+    ETRI 엔드포인트(구어체/문어체) 선택
+    - 최근 성공률(빈 응답/오류 제외)이 높은 엔드포인트를 먼저 호출, 비슷하면 응답이 빠른 쪽
+    - 샘플이 적은 엔드포인트는 성공한 것으로 간주 (기본 순서 유지)
+    - 밀린 엔드포인트는 ETRI_ROUTER_PROBE_INTERVAL마다 한 번 먼저 시도
+    """
+
+    def __init__(self, endpoints, window: int = ETRI_ROUTER_WINDOW, min_samples: int = ETRI_ROUTER_MIN_SAMPLES,
+                 probe_interval: float = ETRI_ROUTER_PROBE_INTERVAL):
+        self.endpoints = {name: EndpointStats(name, window) for name in endpoints}
+        self.preference = list(endpoints)  # 점수가 같으면 이 순서
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.probes = 0
+        self._lock = threading.Lock()
+
+    def _score(self, name: str):
+        endpoint = self.endpoints[name]
+        if len(endpoint.results) < self.min_samples:
+            return (1.0, 0.0)
+        # 성공률은 0.1 단위로 비교하고, 같으면 p50 응답 시간이 짧은 쪽
+        return (round(endpoint.rate(OUTCOME_OK), 1), -_percentile(endpoint.latencies(), 0.5))
+
+    def order(self):
+        """이번 요청에서 시도할 엔드포인트 이름 순서를 반환합니다."""
+        with self._lock:
+            ranked = sorted(self.preference, key=self._score, reverse=True)
+            now = time.monotonic()
+            for name in ranked[1:]:
+                if now - self.endpoints[name].last_attempt >= self.probe_interval:
+                    # 밀린 엔드포인트 상태 확인 (다음 probe까지 다시 뒤로)
+                    self.endpoints[name].last_attempt = now
+                    self.probes += 1
+                    ranked.remove(name)
+                    ranked.insert(0, name)
+                    break
+            return ranked
+
+    def record(self, name: str, outcome: str, latency: float):
+        with self._lock:
+            self.endpoints[name].record(outcome, latency)
+
+    def stats(self) -> dict:
+        with self._lock:
+            ranked = sorted(self.preference, key=self._score, reverse=True)
+            return {
+                "preferred": ranked[0],
+                "probes": self.probes,
+                "endpoints": {name: endpoint.stats() for name, endpoint in self.endpoints.items()}
+            }
@@ -0,0 +1,45 @@
+import inspect
+import functools
+from contextlib import nullcontext
+
+# 단계별 측정 hook: stage 이름을 받아 context manager를 돌려주는 함수 (예: 백엔드 services.metrics.track)
+# 등록하지 않으면 아무것도 측정하지 않음 (ai-engine은 백엔드 없이도 단독 실행 가능)
+_stage_hook = None
+
+
+def set_stage_hook(hook):
+    """단계 측정 hook을 등록합니다. (None이면 해제)"""
+    global _stage_hook
+    _stage_hook = hook
+
+
+def stage(name: str):
+    """with stage("etri.fetch"): ... 형태로 한 구간을 측정"""
+    if _stage_hook is None:
+        return nullcontext()
+    return _stage_hook(name)
+
+
+def instrumented(name: str):
+    """함수 호출 전체를 stage(name)으로 측정하는 데코레이터 (동기/async/async 제너레이터)"""
+    def decorator(fn):
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def agen_wrapper(*args, **kwargs):
+                with stage(name):
+                    async for item in fn(*args, **kwargs):
+                        yield item
+            return agen_wrapper
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
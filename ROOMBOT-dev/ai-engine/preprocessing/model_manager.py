@@ -0,0 +1,94 @@
+import os
+import time
+import threading
+import spacy
+
+# 언어별 기본 모델 (환경변수 SPACY_MODEL_EN, SPACY_MODEL_KO 등으로 변경 가능, 예: en_core_web_md)
+DEFAULT_MODELS = {
+    "en": "en_core_web_sm",
+    "ko": "ko_core_news_sm",
+}
+
+# SVO 추출은 tok2vec/tagger/attribute_ruler(pos_)와 parser(dep_, 문장 분리)만 사용
+DEFAULT_EXCLUDE = ["ner", "lemmatizer"]
+
+
+def _rss_bytes() -> int:
+    """현재 프로세스의 RSS(바이트). 측정할 수 없으면 0."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class SpacyModelManager:
+    """
+    spaCy 모델 수명 관리
+    - 처음 사용할 때 로드 (또는 warmup으로 미리 로드)
+    - SVO 추출에 쓰지 않는 컴포넌트는 로드하지 않음 (SPACY_EXCLUDE / SPACY_EXCLUDE_EN 등)
+    - 언어별 로드 시간과 메모리 사용량(RSS 증가분) 기록
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def model_name(self, lang: str) -> str:
+        return os.getenv(f"SPACY_MODEL_{lang.upper()}", DEFAULT_MODELS.get(lang, ""))
+
+    def excluded(self, lang: str):
+        raw = os.getenv(f"SPACY_EXCLUDE_{lang.upper()}", os.getenv("SPACY_EXCLUDE"))
+        if raw is None:
+            return list(DEFAULT_EXCLUDE)
+        return [name.strip() for name in raw.split(",") if name.strip()]
+
+    def get(self, lang: str = "en"):
+        nlp = self._models.get(lang)
+        if nlp is not None:
+            return nlp
+        with self._lock:
+            nlp = self._models.get(lang)
+            if nlp is None:
+                nlp = self._load(lang)
+                self._models[lang] = nlp
+        return nlp
+
+    def _load(self, lang: str):
+        name = self.model_name(lang)
+        if not name:
+            raise ValueError(f"{lang} 언어의 spaCy 모델이 설정되지 않았습니다.")
+        exclude = self.excluded(lang)
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        nlp = spacy.load(name, exclude=exclude)
+        load_seconds = time.perf_counter() - start
+        memory_mb = max(0, _rss_bytes() - rss_before) / (1024 * 1024)
+        self._stats[lang] = {
+            "model": name,
+            "loaded": True,
+            "pipeline": list(nlp.pipe_names),
+            "excluded": exclude,
+            "load_seconds": round(load_seconds, 3),
+            "memory_mb": round(memory_mb, 1)
+        }
+        print(f"spaCy 모델 로드: {name} ({load_seconds:.2f}초, 약 {memory_mb:.0f}MB, 파이프라인: {nlp.pipe_names})")
+        return nlp
+
+    def warmup(self, langs):
+        """서버 시작 시 모델을 미리 로드합니다."""
+        for lang in langs:
+            self.get(lang)
+
+    def is_loaded(self, lang: str) -> bool:
+        return lang in self._models
+
+    def stats(self) -> dict:
+        return {
+            lang: self._stats.get(lang, {"model": self.model_name(lang), "loaded": False})
+            for lang in sorted(set(DEFAULT_MODELS) | set(self._models))
+        }
+
+
+model_manager = SpacyModelManager()
@@ -0,0 +1,154 @@
+import os
+import atexit
+import hashlib
+import threading
+from spacy.tokens import DocBin
+from spacy.vocab import Vocab
+
+try:
+    from .lru_cache import LRUCache
+except ImportError:  # python 파일명.py로 단독 실행할 때
+    from lru_cache import LRUCache
+
+# DocBin에 저장할 속성 (SVO 추출에 필요한 것만)
+DOCBIN_ATTRS = ["ORTH", "SPACY", "POS", "HEAD", "DEP"]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def serialize_docs(docs) -> bytes:
+    """다른 프로세스로 보낼 수 있도록 Doc들을 DocBin bytes로 (SVO 추출에 필요한 속성만)"""
+    return DocBin(attrs=DOCBIN_ATTRS, docs=docs).to_bytes()
+
+
+class ParseCache:
+    """
+    spaCy 파싱 결과 캐시 (키: 문장 텍스트 해시)
+    - 메모리: 문장별 SVO 추출 결과를 LRU로 보관 (spaCy를 아예 건너뜀)
+    - 디스크(선택): 파싱된 Doc을 DocBin 파일로 저장해 재시작 후에도 재파싱 없이 사용
+    """
+
+    def __init__(self, maxsize: int = 4096, docbin_path: str = None, disk_maxsize: int = 20000, flush_every: int = 100):
+        self.memory = LRUCache(maxsize=maxsize)
+        self.docbin_path = docbin_path
+        self.disk_maxsize = disk_maxsize
+        self.flush_every = flush_every
+        self._disk_docs = {}  # text_hash -> Doc (삽입 순서 = 오래된 순)
+        self.vocab = None  # 디스크 tier Doc의 vocab (load 또는 set_serialized 때 정해짐)
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 여러 스레드가 같은 임시 파일에 동시에 쓰지 않도록
+        self.disk_hits = 0
+
+    def get(self, text: str, extract):
+        """
+        메모리 → 디스크 순으로 찾아 결과를 반환합니다. 없으면 None.
+        extract: Doc에서 결과를 만드는 함수 (디스크 적중 시 사용)
+        """
+        key = text_hash(text)
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+        doc = self._disk_docs.get(key)
+        if doc is None:
+            return None
+        self.disk_hits += 1
+        result = extract(doc)
+        self.memory.set(key, result)
+        return result
+
+    def set(self, text: str, result, doc=None):
+        """결과를 저장합니다. 디스크 tier가 켜져 있으면 파싱된 Doc도 함께 보관."""
+        key = text_hash(text)
+        self.memory.set(key, result)
+        if self.docbin_path is None or doc is None:
+            return
+        with self._lock:
+            if key in self._disk_docs:
+                return
+            self._disk_docs[key] = doc
+            self._unsaved += 1
+            while len(self._disk_docs) > self.disk_maxsize:
+                del self._disk_docs[next(iter(self._disk_docs))]
+            should_flush = self._unsaved >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def set_serialized(self, texts, results, data: bytes = None):
+        """
+        다른 프로세스(SVO 워커)에서 파싱한 결과를 저장합니다.
+        data: serialize_docs로 만든 DocBin bytes (texts와 같은 순서, 디스크 tier가 켜져 있을 때만 사용)
+        """
+        docs = [None] * len(texts)
+        if data is not None and self.docbin_path is not None:
+            # DocBin에 문자열이 함께 들어 있으므로 모델 없이 빈 Vocab으로도 복원 가능
+            if self.vocab is None:
+                self.vocab = Vocab()
+            docs = list(DocBin().from_bytes(data).get_docs(self.vocab))
+        for text, result, doc in zip(texts, results, docs):
+            self.set(text, result, doc)
+
+    def load(self, vocab):
+        """DocBin 파일에서 이전에 파싱한 Doc들을 읽어옵니다."""
+        self.vocab = vocab
+        if self.docbin_path is None or not os.path.exists(self.docbin_path):
+            return
+        try:
+            doc_bin = DocBin(attrs=DOCBIN_ATTRS).from_disk(self.docbin_path)
+            with self._lock:
+                for doc in doc_bin.get_docs(vocab):
+                    self._disk_docs[text_hash(doc.text)] = doc
+            print(f"DocBin 캐시 로드: {len(self._disk_docs)}개 문장 ({self.docbin_path})")
+        except Exception as e:
+            print(f"DocBin 캐시 로드 실패: {e}")
+
+    def flush(self):
+        """보관 중인 Doc 전체를 DocBin 파일로 저장합니다."""
+        if self.docbin_path is None:
+            return
+        with self._flush_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                docs = list(self._disk_docs.values())
+                self._unsaved = 0
+            try:
+                doc_bin = DocBin(attrs=DOCBIN_ATTRS, docs=docs)
+                tmp_path = f"{self.docbin_path}.tmp"
+                doc_bin.to_disk(tmp_path)
+                os.replace(tmp_path, self.docbin_path)
+            except Exception as e:
+                print(f"DocBin 캐시 저장 실패: {e}")
+
+    def clear(self):
+        self.memory.clear()
+        with self._lock:
+            self._disk_docs.clear()
+            self._unsaved = 0
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": self.docbin_path is not None,
+                "size": len(self._disk_docs),
+                "maxsize": self.disk_maxsize,
+                "hits": self.disk_hits
+            }
+        }
+
+
+def create_parse_cache(vocab=None):
+    """환경변수 설정으로 ParseCache를 만들고, 디스크 tier가 있으면 불러옵니다."""
+    cache = ParseCache(
+        maxsize=int(os.getenv("SVO_EN_CACHE_SIZE", "4096")),
+        docbin_path=os.getenv("SVO_EN_DOCBIN_PATH") or None,
+        disk_maxsize=int(os.getenv("SVO_EN_DOCBIN_MAX", "20000")),
+        flush_every=int(os.getenv("SVO_EN_DOCBIN_FLUSH_EVERY", "100"))
+    )
+    if vocab is not None:
+        cache.load(vocab)
+    atexit.register(cache.flush)
+    return cache
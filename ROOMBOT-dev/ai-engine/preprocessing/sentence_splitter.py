@@ -1,16 +1,17 @@
 import re
 
+# 문장 끝 패턴: 마침표/느낌표/물음표(연속 허용) + 인용부호/괄호 0개 이상
+# 그 뒤에 공백이 있든 없든, 문장부호가 아닌 글자가 오면 분리
+SENTENCE_END_PATTERN = re.compile(r'([.!?]+[\"\'”’)]*)(?=[^.!?\"\'”’)])')
+
 def split_sentences(text: str):
     """
     마침표/느낌표/물음표 + 인용부호/괄호 등 뒤에서
     공백이 없어도 문장 경계로 분리.
     """
-    # 문장 끝 패턴: 마침표/느낌표/물음표 + 인용부호/괄호 0~2개
-    # 그 뒤에 공백이 없거나, 바로 한글/영문 대문자가 오면 분리
-    pattern = re.compile(r'([.!?][\"\'”’)]*)(?=[^\s])')
     parts = []
     start = 0
-    for match in pattern.finditer(text):
+    for match in SENTENCE_END_PATTERN.finditer(text):
         end = match.end()
         parts.append(text[start:end].strip())
         start = end
@@ -40,6 +41,43 @@ def to_structured_json(answer: str):
             for i, s in enumerate(sentences)
         ]
     }
+class IncrementalSentenceSplitter:
+    """
+    스트리밍 텍스트(GPT 토큰 등)를 조금씩 받아 완성된 문장을 바로 돌려주는 분리기.
+    split_sentences와 같은 경계 규칙을 사용하며, 모든 조각을 feed한 뒤 flush하면
+    split_sentences(전체 텍스트)와 같은 결과를 얻습니다.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._next_id = 1
+
+    def feed(self, chunk: str):
+        """텍스트 조각을 추가하고, 경계가 확정된 문장 리스트를 반환합니다."""
+        self._buffer += chunk
+        sentences = []
+        start = 0
+        # 패턴은 경계 뒤의 글자까지 확인하므로, 찾은 경계는 이후 입력과 무관하게 확정됨
+        for match in SENTENCE_END_PATTERN.finditer(self._buffer):
+            end = match.end()
+            sentence = self._buffer[start:end].strip()
+            if sentence:
+                sentences.append(self._emit(sentence))
+            start = end
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        """남아 있는 마지막 문장을 반환합니다. (스트림 종료 시 호출)"""
+        last = self._buffer.strip()
+        self._buffer = ""
+        return [self._emit(last)] if last else []
+
+    def _emit(self, text: str):
+        sentence = {"sentence_id": self._next_id, "text": text}
+        self._next_id += 1
+        return sentence
+
 '''# backend/api/analyze.py
 
 from fastapi import APIRouter, Body
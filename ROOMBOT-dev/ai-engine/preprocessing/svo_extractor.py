@@ -1,7 +1,20 @@
-from .svo_extractor_en import analyze_svo_en
-from .svo_extractor_ko import analyze_svo_ko
+from .svo_extractor_en import analyze_svo_en, extract_svo_en_batch, format_svo_en
+from .svo_extractor_ko import analyze_svo_ko, analyze_svo_ko_batch
 
 def analyze_svo(text: str, lang: str, api_key: str = None):
     if lang == "ko":
         return analyze_svo_ko(text, api_key)
     return analyze_svo_en(text)
+
+def analyze_svo_batch(sentences, lang: str, api_key: str = None):
+    """
+    to_structured_json()의 "sentences" 리스트를 받아 문장별 SVO 결과를 반환합니다.
+    반환: [{"sentence_id", "sentence", "language", "svo": {"subject", "verb", "object"}}]
+    """
+    if lang == "ko":
+        # 여러 문장을 ETRI 요청 하나로 묶어 보냄
+        return analyze_svo_ko_batch(sentences, api_key)
+    return [
+        {"sentence_id": r["sentence_id"], **format_svo_en(r["sentence"], r["svo"])}
+        for r in extract_svo_en_batch(sentences)
+    ]
@@ -1,9 +1,59 @@
-import spacy
+import os
 
-nlp = spacy.load("en_core_web_sm")
+try:
+    from .parse_cache import create_parse_cache, serialize_docs
+    from .model_manager import model_manager
+    from .instrumentation import instrumented
+except ImportError:  # python svo_extractor_en.py로 단독 실행할 때
+    from parse_cache import create_parse_cache, serialize_docs
+    from model_manager import model_manager
+    from instrumentation import instrumented
 
+# 문장별 파싱 결과 캐시 (같은 문장은 spaCy를 다시 돌리지 않음)
+# 디스크 tier의 Doc은 모델 vocab이 필요하므로 모델을 처음 로드할 때 읽어옴
+parse_cache = create_parse_cache()
+_parse_cache_loaded = False
+
+def load_parse_cache(vocab=None):
+    """
+    디스크 tier를 한 번만 읽어옴
+    vocab이 없으면 빈 Vocab 사용 (모델을 워커 프로세스에만 로드하는 경우)
+    """
+    global _parse_cache_loaded
+    if _parse_cache_loaded:
+        return
+    _parse_cache_loaded = True
+    if vocab is None:
+        from spacy.vocab import Vocab
+        vocab = Vocab()
+    parse_cache.load(vocab)
+
+def get_nlp():
+    """영어 spaCy 모델을 반환합니다. (처음 호출할 때 로드)"""
+    nlp = model_manager.get("en")
+    load_parse_cache(nlp.vocab)
+    return nlp
+
+# nlp.pipe 배치 설정 (n_process > 1이면 멀티프로세스로 파싱)
+SVO_EN_BATCH_SIZE = int(os.getenv("SVO_EN_BATCH_SIZE", "32"))
+SVO_EN_N_PROCESS = int(os.getenv("SVO_EN_N_PROCESS", "1"))
+
+@instrumented("spacy.extract_svo_en")
 def extract_svo_en(sentence: str):
-    doc = nlp(sentence)
+    cached = parse_cache.get(sentence, _extract_svo_from_tokens)
+    if cached is not None:
+        return _copy_svo(cached)
+    doc = get_nlp()(sentence)
+    result = _extract_svo_from_tokens(doc)
+    parse_cache.set(sentence, result, doc)
+    return _copy_svo(result)
+
+def _copy_svo(result: dict):
+    # 캐시에 든 결과가 호출한 쪽에서 수정되지 않도록 복사해서 반환
+    return {key: list(values) for key, values in result.items()}
+
+def _extract_svo_from_tokens(doc):
+    """파싱된 Doc 또는 Span(doc.sents의 문장)에서 SVO를 추출합니다."""
     subjects = []
     verbs = []
     objects = []
@@ -30,21 +80,71 @@ def extract_svo_en(sentence: str):
         "O": objects
     }
 
+@instrumented("spacy.extract_svo_en_batch")
+def extract_svo_en_batch(sentences, batch_size: int = None, n_process: int = None):
+    """
+    여러 문장을 nlp.pipe로 한 번에 파싱해 SVO를 추출합니다.
+    - sentences: 문자열 리스트 또는 to_structured_json()의 "sentences" 리스트
+    - 반환: [{"sentence_id", "sentence", "svo": {"S", "V", "O"}}] (입력 순서와 sentence_id 유지)
+    """
+    items = [
+        (s["sentence_id"], s["text"]) if isinstance(s, dict) else (i + 1, s)
+        for i, s in enumerate(sentences)
+    ]
+    results = {}
+    # 캐시에 없는 문장만 파싱
+    misses = []
+    for _, text in items:
+        if text in results:
+            continue
+        cached = parse_cache.get(text, _extract_svo_from_tokens)
+        if cached is not None:
+            results[text] = cached
+        else:
+            results[text] = None
+            misses.append(text)
+    if misses:
+        docs = get_nlp().pipe(
+            misses,
+            batch_size=batch_size or SVO_EN_BATCH_SIZE,
+            n_process=n_process or SVO_EN_N_PROCESS
+        )
+        for text, doc in zip(misses, docs):
+            results[text] = _extract_svo_from_tokens(doc)
+            parse_cache.set(text, results[text], doc)
+    return [
+        {"sentence_id": sentence_id, "sentence": text, "svo": _copy_svo(results[text])}
+        for sentence_id, text in items
+    ]
+
+@instrumented("spacy.parse_svo_en_docs")
+def parse_svo_en_docs(sentences, with_docs: bool = True):
+    """
+    SVO 워커 프로세스용: 문장들을 파싱해 ([SVO 결과], DocBin bytes)를 반환
+    Doc은 부모 프로세스가 디스크 tier에 저장하도록 직렬화해서 돌려줌 (with_docs=False면 None)
+    """
+    docs = list(get_nlp().pipe(sentences, batch_size=SVO_EN_BATCH_SIZE))
+    results = [_extract_svo_from_tokens(doc) for doc in docs]
+    return results, serialize_docs(docs) if with_docs else None
+
+def format_svo_en(text: str, svo_result: dict):
+    """S/V/O 리스트 결과를 API 응답 형식(첫 번째 후보만)으로 변환합니다."""
+    return {
+        "sentence": text,
+        "language": "en",
+        "svo": {
+            "subject": svo_result["S"][0] if svo_result["S"] else "Subject",
+            "verb": svo_result["V"][0] if svo_result["V"] else "Verb",
+            "object": svo_result["O"][0] if svo_result["O"] else "Object"
+        }
+    }
+
 def analyze_svo_en(text: str):
     """영어 텍스트의 SVO 분석"""
     try:
-        doc = nlp(text)
         svo_result = extract_svo_en(text)
         
-        return {
-            "sentence": text,
-            "language": "en",
-            "svo": {
-                "subject": svo_result["S"][0] if svo_result["S"] else "Subject",
-                "verb": svo_result["V"][0] if svo_result["V"] else "Verb",
-                "object": svo_result["O"][0] if svo_result["O"] else "Object"
-            }
-        }
+        return format_svo_en(text, svo_result)
     except Exception as e:
         print(f"영어 SVO 분석 오류: {e}")
         return {
@@ -59,8 +159,8 @@ def analyze_svo_en(text: str):
 
 
 def analyze_svo_from_text(text: str):
-    sentences = [sent.text.strip() for sent in nlp(text).sents]
-    return [{"sentence": s, "svo": extract_svo_en(s)} for s in sentences]
+    # 문장마다 다시 파싱하지 않고, 한 번 파싱한 Doc의 문장(Span)을 그대로 사용
+    return [{"sentence": sent.text.strip(), "svo": _extract_svo_from_tokens(sent)} for sent in get_nlp()(text).sents]
 
 
 # 테스트
@@ -1,112 +1,190 @@
 # -*- coding:utf-8 -*-
-import requests
-import json
 import os
+import time
+import asyncio
 from dotenv import load_dotenv
 
+try:
+    from .etri_client import get_etri_client
+    from .etri_router import EtriRouter, OUTCOME_OK, OUTCOME_EMPTY, OUTCOME_ERROR
+    from .etri_cache import create_etri_cache, normalize_text
+    from .svo_extractor_ko_rules import extract_svo_rules, SVO_KO_RULES_ENABLED, SVO_KO_RULES_THRESHOLD
+    from .etri_parser import parse_etri_response, maybe_dump
+    from .instrumentation import instrumented, stage
+except ImportError:  # python svo_extractor_ko.py로 단독 실행할 때
+    from etri_client import get_etri_client
+    from etri_router import EtriRouter, OUTCOME_OK, OUTCOME_EMPTY, OUTCOME_ERROR
+    from etri_cache import create_etri_cache, normalize_text
+    from svo_extractor_ko_rules import extract_svo_rules, SVO_KO_RULES_ENABLED, SVO_KO_RULES_THRESHOLD
+    from etri_parser import parse_etri_response, maybe_dump
+    from instrumentation import instrumented, stage
+
 load_dotenv()
 
-ETRI_API_URL = "http://epretx.etri.re.kr:8000/api/WiseNLU"
-ETRI_SPOKEN_API_URL = "http://epretx.etri.re.kr:8000/api/WiseNLU_spoken"
+# 부하 테스트 등에서는 환경변수로 다른 서버(예: loadtest/stub_server.py)를 지정
+ETRI_API_URL = os.getenv("ETRI_API_URL", "http://epretx.etri.re.kr:8000/api/WiseNLU")
+ETRI_SPOKEN_API_URL = os.getenv("ETRI_SPOKEN_API_URL", "http://epretx.etri.re.kr:8000/api/WiseNLU_spoken")
 DEFAULT_ANALYSIS_CODE = "srl"  # 의미역 분석 (소문자로 다시 시도)
 
-def extract_svo_korean_etri(text: str, api_key: str = None):
+# 여러 문장을 한 번에 보낼 때 요청 하나에 담을 최대 글자 수
+ETRI_MAX_BATCH_CHARS = int(os.getenv("ETRI_MAX_BATCH_CHARS", "4000"))
+
+# SRL/dependency에서 SVO를 뽑는 로직을 바꾸면 올려야 함 (이전 버전의 캐시 결과는 사용하지 않음)
+PARSER_VERSION = "2"
+
+# 구어체/문어체 중 최근에 잘 응답한 엔드포인트를 먼저 호출 (기본 순서: 구어체 → 문어체)
+etri_router = EtriRouter(["spoken", "written"])
+
+# 같은 문장은 ETRI를 다시 호출하지 않도록 분석 결과(SVO)를 캐시
+etri_cache = create_etri_cache(PARSER_VERSION)
+
+def _endpoint_url(name: str):
+    return ETRI_SPOKEN_API_URL if name == "spoken" else ETRI_API_URL
+
+def _get_api_key(api_key: str = None):
     if api_key is None:
         api_key = os.getenv("ETRI_API_KEY")  # 환경변수에서 가져옴
         if api_key is None:
             raise ValueError("ETRI API 키가 제공되지 않았습니다.")
+    return api_key
 
-    headers = {
-        "Content-Type": "application/json; charset=UTF-8",
-        "Authorization": api_key
-    }
 
-    payload = {
-        "argument": {
-            "text": text,
-            "analysis_code": DEFAULT_ANALYSIS_CODE
+def _srl_triples(sentences):
+    """파싱된 문장 리스트에서 SRL(의미역) 기반 SVO 트리플을 추출합니다."""
+    return [
+        {"S": subject, "V": verb, "O": obj}
+        for sentence in sentences
+        for subject, verb, obj in sentence.triples
+    ]
+
+
+def _dependency_svo(sentence):
+    """한 문장의 dependency(주어/서술어)와 word(목적어 대용) 정보로 SVO를 추출합니다."""
+    subject = sentence.subject
+    verb = sentence.predicate
+    # 목적어는 간단히 추출 (실제로는 더 복잡한 로직 필요)
+    object_text = next((word for word in sentence.words if word not in subject and word not in verb), "")
+    return subject, verb, object_text
+
+
+def format_svo_ko(text: str, subject: str = "", verb: str = "", obj: str = ""):
+    """S/V/O 결과를 API 응답 형식으로 변환합니다. (빈 값은 자리표시자로)"""
+    return {
+        "sentence": text,
+        "language": "ko",
+        "svo": {
+            "subject": subject if subject else "주어",
+            "verb": verb if verb else "동사",
+            "object": obj if obj else "목적어"
         }
     }
 
-    response = requests.post(ETRI_API_URL, headers=headers, data=json.dumps(payload))
 
+def analyze_etri_response(text: str, sentences):
+    """
+    ETRI 응답 하나(parse_etri_response 결과)로 SVO를 분석합니다. (추가 API 호출 없음)
+    SRL 트리플 → dependency 주어/서술어 + word 목적어 → 자리표시자 순으로 사용
+    """
+    for sentence in sentences:
+        if sentence.triples:
+            # 첫 번째 SVO 결과 반환
+            return format_svo_ko(text, *sentence.triples[0])
+    if sentences:
+        # SRL이 없는 경우 dependency 정보를 활용한 간단한 SVO 추출
+        return format_svo_ko(text, *_dependency_svo(sentences[0]))
+    return format_svo_ko(text)
+
+
+def _check_response(name: str, response):
+    """응답을 (결과, 파싱된 문장 리스트)로 분류합니다."""
     if response.status_code != 200:
         raise Exception(f"ETRI API 호출 실패: {response.status_code} - {response.text}")
+    maybe_dump(f"ETRI {name} API Response", response.content)
+    sentences = parse_etri_response(response.content)
+    return (OUTCOME_OK if sentences else OUTCOME_EMPTY), sentences
 
-    data = response.json()
-    print(f"API Response: {json.dumps(data, indent=2, ensure_ascii=False)}")  # 전체 응답 출력
-    
-    sentences = data.get("return_object", {}).get("sentence", [])
 
-    svo_list = []
-    for sentence in sentences:
-        # SRL 필드에서 의미역 정보 추출
-        srl_list = sentence.get("SRL", [])
-        for srl in srl_list:
-            verb = srl.get("verb", "")
-            subject = None
-            obj = None
-            
-            # argument에서 주어(ARG0)와 목적어(ARG1, ARG2) 찾기
-            for arg in srl.get("argument", []):
-                arg_type = arg.get("type", "")
-                arg_text = arg.get("text", "")
-                
-                if arg_type == "ARG0":  # 주어
-                    subject = arg_text
-                elif arg_type in ["ARG1", "ARG2"]:  # 목적어
-                    obj = arg_text
-            
-            # SVO가 모두 있는 경우만 추가
-            if subject and verb and obj:
-                svo_list.append({
-                    "S": subject,
-                    "V": verb,
-                    "O": obj
-                })
-        
-        # 기존 semantic_role 필드도 확인 (하위 호환성)
-        semantic_roles = sentence.get("semantic_role", [])
-        for srl in semantic_roles:
-            verb = srl.get("predicate", {}).get("text", "")
-            subject = None
-            obj = None
-            for arg in srl.get("argument", []):
-                if arg["type"] == "ARG0":
-                    subject = arg["text"]
-                elif arg["type"] in ["ARG1", "ARG2"]:
-                    obj = arg["text"]
-            if subject and verb and obj:
-                svo_list.append({
-                    "S": subject,
-                    "V": verb,
-                    "O": obj
-                })
-
-    return svo_list
+@instrumented("etri.fetch_etri_analysis")
+def fetch_etri_analysis(text: str, api_key: str = None):
+    """
+    etri_router가 정한 순서로 엔드포인트를 호출하고, 문장 정보가 있는 첫 응답을 반환합니다.
+    모두 빈 응답이면 마지막 빈 응답을, 모두 실패하면 마지막 오류를 올립니다.
+    반환: (엔드포인트 이름, parse_etri_response 결과)
+    """
+    api_key = _get_api_key(api_key)
+    client = get_etri_client()
+    sentences = None
+    error = None
+    endpoint = None
+    for name in etri_router.order():
+        start = time.perf_counter()
+        try:
+            with stage(f"etri.{name}"):
+                outcome, sentences = _check_response(name, client.post(_endpoint_url(name), text, DEFAULT_ANALYSIS_CODE, api_key))
+        except Exception as e:
+            etri_router.record(name, OUTCOME_ERROR, time.perf_counter() - start)
+            print(f"ETRI {name} API 오류: {e}")
+            error = e
+            continue
+        etri_router.record(name, outcome, time.perf_counter() - start)
+        endpoint = name
+        if outcome == OUTCOME_OK:
+            return endpoint, sentences
+        print(f"ETRI {name} API 빈 응답")
+    if sentences is not None:
+        return endpoint, sentences
+    raise error
 
 
-def extract_svo_korean_etri_spoken(text: str, api_key: str = None):
-    """구어체 ETRI API를 사용한 SVO 추출"""
-    if api_key is None:
-        api_key = os.getenv("ETRI_API_KEY")  # 환경변수에서 가져옴
-        if api_key is None:
-            raise ValueError("ETRI API 키가 제공되지 않았습니다.")
+@instrumented("etri.fetch_etri_analysis_async")
+async def fetch_etri_analysis_async(text: str, api_key: str = None):
+    """fetch_etri_analysis의 비동기 버전"""
+    api_key = _get_api_key(api_key)
+    client = get_etri_client()
+    sentences = None
+    error = None
+    endpoint = None
+    for name in etri_router.order():
+        start = time.perf_counter()
+        try:
+            with stage(f"etri.{name}"):
+                outcome, sentences = _check_response(name, await client.apost(_endpoint_url(name), text, DEFAULT_ANALYSIS_CODE, api_key))
+        except Exception as e:
+            etri_router.record(name, OUTCOME_ERROR, time.perf_counter() - start)
+            print(f"ETRI {name} API 오류: {e}")
+            error = e
+            continue
+        etri_router.record(name, outcome, time.perf_counter() - start)
+        endpoint = name
+        if outcome == OUTCOME_OK:
+            return endpoint, sentences
+        print(f"ETRI {name} API 빈 응답")
+    if sentences is not None:
+        return endpoint, sentences
+    raise error
 
-    headers = {
-        "Content-Type": "application/json; charset=UTF-8",
-        "Authorization": api_key
-    }
 
-    payload = {
-        "argument": {
-            "text": text,
-            "analysis_code": DEFAULT_ANALYSIS_CODE
-        }
-    }
+@instrumented("etri.extract_svo_korean_etri")
+def extract_svo_korean_etri(text: str, api_key: str = None):
+    api_key = _get_api_key(api_key)
+
+    response = get_etri_client().post(ETRI_API_URL, text, DEFAULT_ANALYSIS_CODE, api_key)
+
+    if response.status_code != 200:
+        raise Exception(f"ETRI API 호출 실패: {response.status_code} - {response.text}")
+
+    maybe_dump("API Response", response.content)  # 원본 응답 (ETRI_DEBUG_DUMP_RATE 비율로만)
+    
+    return _srl_triples(parse_etri_response(response.content))
+
+
+@instrumented("etri.extract_svo_korean_etri_spoken")
+def extract_svo_korean_etri_spoken(text: str, api_key: str = None):
+    """구어체 ETRI API를 사용한 SVO 추출"""
+    api_key = _get_api_key(api_key)
 
     try:
-        response = requests.post(ETRI_SPOKEN_API_URL, headers=headers, data=json.dumps(payload))
+        response = get_etri_client().post(ETRI_SPOKEN_API_URL, text, DEFAULT_ANALYSIS_CODE, api_key)
         
         if response.status_code != 200:
             print(f"구어체 API HTTP 오류: {response.status_code}")
@@ -114,62 +192,15 @@ def extract_svo_korean_etri_spoken(text: str, api_key: str = None):
             print("구어체 API 실패, 일반 API로 재시도...")
             return extract_svo_korean_etri(text, api_key)
 
-        data = response.json()
-        print(f"구어체 API Response: {json.dumps(data, indent=2, ensure_ascii=False)}")  # 전체 응답 출력
+        maybe_dump("구어체 API Response", response.content)  # 원본 응답 (ETRI_DEBUG_DUMP_RATE 비율로만)
+        sentences = parse_etri_response(response.content)
         
         # 빈 응답 체크
-        if not data.get("return_object") or not data["return_object"].get("sentence"):
+        if not sentences:
             print("구어체 API 빈 응답, 일반 API로 재시도...")
             return extract_svo_korean_etri(text, api_key)
         
-        sentences = data.get("return_object", {}).get("sentence", [])
-
-        svo_list = []
-        for sentence in sentences:
-            # SRL 필드에서 의미역 정보 추출
-            srl_list = sentence.get("SRL", [])
-            for srl in srl_list:
-                verb = srl.get("verb", "")
-                subject = None
-                obj = None
-                
-                # argument에서 주어(ARG0)와 목적어(ARG1, ARG2) 찾기
-                for arg in srl.get("argument", []):
-                    arg_type = arg.get("type", "")
-                    arg_text = arg.get("text", "")
-                    
-                    if arg_type == "ARG0":  # 주어
-                        subject = arg_text
-                    elif arg_type in ["ARG1", "ARG2"]:  # 목적어
-                        obj = arg_text
-                
-                # SVO가 모두 있는 경우만 추가
-                if subject and verb and obj:
-                    svo_list.append({
-                        "S": subject,
-                        "V": verb,
-                        "O": obj
-                    })
-            
-            # 기존 semantic_role 필드도 확인 (하위 호환성)
-            semantic_roles = sentence.get("semantic_role", [])
-            for srl in semantic_roles:
-                verb = srl.get("predicate", {}).get("text", "")
-                subject = None
-                obj = None
-                for arg in srl.get("argument", []):
-                    if arg["type"] == "ARG0":
-                        subject = arg["text"]
-                    elif arg["type"] in ["ARG1", "ARG2"]:
-                        obj = arg["text"]
-                if subject and verb and obj:
-                    svo_list.append({
-                        "S": subject,
-                        "V": verb,
-                        "O": obj
-                    })
-
-        return svo_list
+        return _srl_triples(sentences)
         
     except Exception as e:
         print(f"구어체 API 오류: {e}")
@@ -177,6 +208,248 @@ def extract_svo_korean_etri_spoken(text: str, api_key: str = None):
         return extract_svo_korean_etri(text, api_key)
 
 
+@instrumented("etri.extract_svo_from_dependency")
+def extract_svo_from_dependency(text: str, api_key: str = None):
+    """dependency 정보를 활용한 SVO 추출"""
+    api_key = _get_api_key(api_key)
+
+    response = get_etri_client().post(ETRI_API_URL, text, "srl", api_key)
+    
+    if response.status_code != 200:
+        raise Exception(f"ETRI API 호출 실패: {response.status_code}")
+
+    sentences = parse_etri_response(response.content)
+    
+    if not sentences:
+        raise Exception("문장 정보를 찾을 수 없습니다.")
+    
+    return format_svo_ko(text, *_dependency_svo(sentences[0]))
+
+
+def _cached_svo_ko(text: str, cached: dict):
+    return {"sentence": text, "language": "ko", "svo": dict(cached)}
+
+
+# 규칙 기반 추출 / ETRI 호출 / ETRI 실패 시 규칙 기반 결과로 대체한 횟수
+rules_stats = {"local": 0, "etri": 0, "local_fallback": 0}
+
+
+def local_rules_stats() -> dict:
+    return {"enabled": SVO_KO_RULES_ENABLED, "threshold": SVO_KO_RULES_THRESHOLD, **rules_stats}
+
+
+def _local_svo(text: str):
+    """규칙 기반 결과의 신뢰도가 충분하면 (결과, 규칙 결과), 아니면 (None, 규칙 결과)"""
+    if not SVO_KO_RULES_ENABLED:
+        return None, None
+    rules = extract_svo_rules(text)
+    if rules["confidence"] >= SVO_KO_RULES_THRESHOLD:
+        rules_stats["local"] += 1
+        return format_svo_ko(text, rules["S"], rules["V"], rules["O"]), rules
+    return None, rules
+
+
+def _fallback_svo(text: str, rules: dict = None):
+    """ETRI로 분석하지 못했을 때: 규칙 기반 결과(찾은 성분만) → 자리표시자"""
+    if rules is None and SVO_KO_RULES_ENABLED:
+        rules = extract_svo_rules(text)
+    if rules and (rules["S"] or rules["V"] or rules["O"]):
+        rules_stats["local_fallback"] += 1
+        return format_svo_ko(text, rules["S"], rules["V"], rules["O"])
+    return format_svo_ko(text)
+
+
+@instrumented("svo_ko.analyze_svo_ko")
+def analyze_svo_ko(text: str, api_key: str = None):
+    """
+    한국어 텍스트의 SVO 분석
+    1. 격조사/어미 규칙으로 추출해 신뢰도가 높으면 바로 반환 (SVO_KO_RULES_THRESHOLD)
+    2. 이전에 분석한 문장은 etri_cache의 결과를 사용
+    3. ETRI 응답 하나에서 SRL → dependency → word 순으로 추출 (같은 요청을 다시 보내지 않음)
+    ETRI가 실패하거나 문장 정보가 없으면 규칙 기반 결과로 대체
+    """
+    result, rules = _local_svo(text)
+    if result is not None:
+        return result
+    cached = etri_cache.get(DEFAULT_ANALYSIS_CODE, text)
+    if cached is not None:
+        return _cached_svo_ko(text, cached)
+    try:
+        endpoint, sentences = fetch_etri_analysis(text, api_key)
+        result = analyze_etri_response(text, sentences)
+    except Exception as e:
+        print(f"SVO 분석 오류: {e}")
+        # 최종 폴백 (오류 결과는 캐시하지 않음)
+        return _fallback_svo(text, rules)
+    rules_stats["etri"] += 1
+    if not sentences:
+        result = _fallback_svo(text, rules)
+    etri_cache.set(endpoint, DEFAULT_ANALYSIS_CODE, text, result["svo"], empty=not sentences)
+    return result
+
+
+@instrumented("svo_ko.analyze_svo_ko_async")
+async def analyze_svo_ko_async(text: str, api_key: str = None):
+    """analyze_svo_ko의 비동기 버전"""
+    result, rules = _local_svo(text)
+    if result is not None:
+        return result
+    cached = await etri_cache.aget(DEFAULT_ANALYSIS_CODE, text)
+    if cached is not None:
+        return _cached_svo_ko(text, cached)
+    try:
+        endpoint, sentences = await fetch_etri_analysis_async(text, api_key)
+        result = analyze_etri_response(text, sentences)
+    except Exception as e:
+        print(f"SVO 분석 오류: {e}")
+        return _fallback_svo(text, rules)
+    rules_stats["etri"] += 1
+    if not sentences:
+        result = _fallback_svo(text, rules)
+    await etri_cache.aset(endpoint, DEFAULT_ANALYSIS_CODE, text, result["svo"], empty=not sentences)
+    return result
+
+
+def _pack_batches(texts, max_chars: int = None):
+    """문장들을 줄바꿈으로 이어 붙였을 때 max_chars를 넘지 않도록 묶습니다. (긴 문장은 단독으로)"""
+    max_chars = max_chars or ETRI_MAX_BATCH_CHARS
+    batches = []
+    current = []
+    size = 0
+    for text in texts:
+        added = len(text) + (1 if current else 0)
+        if current and size + added > max_chars:
+            batches.append(current)
+            current = []
+            size = 0
+            added = len(text)
+        current.append(text)
+        size += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _compact(text: str):
+    # ETRI가 돌려주는 문장 text와 비교하기 위해 공백을 모두 제거
+    return normalize_text(text).replace(" ", "")
+
+
+def demux_etri_response(texts, entries):
+    """
+    여러 문장을 한 번에 보낸 ETRI 응답의 sentence 항목을 원래 문장에 다시 나눠 담습니다.
+    ETRI가 한 문장을 여러 개로 나눈 경우는 이어지는 항목을 합쳐 같은 문장에 할당
+    entries: parse_etri_response 결과
+    반환: {문장: 분석 결과}, 항목 text가 원래 문장과 맞지 않으면 None
+    """
+    results = {}
+    index = 0
+    for text in texts:
+        target = _compact(text)
+        matched = []
+        joined = ""
+        while index < len(entries) and len(joined) < len(target):
+            joined += _compact(entries[index].text)
+            matched.append(entries[index])
+            index += 1
+        if not matched or joined != target:
+            return None
+        results[text] = analyze_etri_response(text, matched)
+    if index != len(entries):
+        return None
+    return results
+
+
+def _batch_items(sentences):
+    return [
+        (s["sentence_id"], s["text"]) if isinstance(s, dict) else (i + 1, s)
+        for i, s in enumerate(sentences)
+    ]
+
+
+def _batch_lookup(items):
+    """규칙 기반/캐시에서 찾은 결과와, ETRI로 보내야 하는 문장(중복 제거) 목록을 반환합니다."""
+    results = {}
+    misses = []
+    for _, text in items:
+        if text in results:
+            continue
+        results[text], _ = _local_svo(text)
+        if results[text] is not None:
+            continue
+        cached = etri_cache.get(DEFAULT_ANALYSIS_CODE, text)
+        if cached is not None:
+            results[text] = _cached_svo_ko(text, cached)
+        else:
+            misses.append(text)
+    return results, misses
+
+
+@instrumented("svo_ko.analyze_svo_ko_batch")
+def analyze_svo_ko_batch(sentences, api_key: str = None):
+    """
+    여러 문장의 한국어 SVO를 ETRI 요청 몇 번으로 분석합니다.
+    - sentences: 문자열 리스트 또는 to_structured_json()의 "sentences" 리스트
+    - 캐시에 없는 문장만 ETRI_MAX_BATCH_CHARS 단위로 묶어 한 번에 보내고, 응답을 문장별로 나눔
+    - 응답의 문장 구분이 원래 문장과 맞지 않으면 그 묶음만 문장별로 다시 분석
+    반환: [{"sentence_id", "sentence", "language", "svo"}] (입력 순서 유지)
+    """
+    items = _batch_items(sentences)
+    results, misses = _batch_lookup(items)
+    for batch in _pack_batches(misses):
+        if len(batch) == 1:
+            results[batch[0]] = analyze_svo_ko(batch[0], api_key)
+            continue
+        try:
+            endpoint, entries = fetch_etri_analysis("\n".join(batch), api_key)
+            batch_results = demux_etri_response(batch, entries)
+        except Exception as e:
+            print(f"SVO 배치 분석 오류: {e}")
+            for text in batch:
+                results[text] = _fallback_svo(text)
+            continue
+        if batch_results is None:
+            print(f"ETRI 응답의 문장 구분이 맞지 않아 {len(batch)}개 문장을 하나씩 분석합니다.")
+            for text in batch:
+                results[text] = analyze_svo_ko(text, api_key)
+            continue
+        rules_stats["etri"] += len(batch)
+        for text, result in batch_results.items():
+            etri_cache.set(endpoint, DEFAULT_ANALYSIS_CODE, text, result["svo"])
+            results[text] = result
+    return [{"sentence_id": sentence_id, **results[text]} for sentence_id, text in items]
+
+
+@instrumented("svo_ko.analyze_svo_ko_batch_async")
+async def analyze_svo_ko_batch_async(sentences, api_key: str = None):
+    """analyze_svo_ko_batch의 비동기 버전"""
+    items = _batch_items(sentences)
+    # 규칙 추출과 캐시(sqlite) 조회가 문장 수만큼 반복되므로 이벤트 루프를 막지 않도록 스레드에서 한 번에
+    results, misses = await asyncio.to_thread(_batch_lookup, items)
+    for batch in _pack_batches(misses):
+        if len(batch) == 1:
+            results[batch[0]] = await analyze_svo_ko_async(batch[0], api_key)
+            continue
+        try:
+            endpoint, entries = await fetch_etri_analysis_async("\n".join(batch), api_key)
+            batch_results = demux_etri_response(batch, entries)
+        except Exception as e:
+            print(f"SVO 배치 분석 오류: {e}")
+            for text in batch:
+                results[text] = _fallback_svo(text)
+            continue
+        if batch_results is None:
+            print(f"ETRI 응답의 문장 구분이 맞지 않아 {len(batch)}개 문장을 하나씩 분석합니다.")
+            for text in batch:
+                results[text] = await analyze_svo_ko_async(text, api_key)
+            continue
+        rules_stats["etri"] += len(batch)
+        for text, result in batch_results.items():
+            await etri_cache.aset(endpoint, DEFAULT_ANALYSIS_CODE, text, result["svo"])
+            results[text] = result
+    return [{"sentence_id": sentence_id, **results[text]} for sentence_id, text in items]
+
+
 if __name__ == "__main__":
     # 핵심 테스트 케이스들 (성공/실패 패턴 분석용)
     test_sentences = [
@@ -257,106 +530,3 @@ if __name__ == "__main__":
     print("✅ 성공하는 문장: 명확한 주어-동사-목적어 구조")
     print("❌ 실패하는 문장: 복잡한 서술, 인사말, 형용사 서술어")
     print("💡 구어체 API는 현재 빈 응답을 반환하여 일반 API로 폴백됨")
-
-
-def analyze_svo_ko(text: str, api_key: str = None):
-    """한국어 텍스트의 SVO 분석"""
-    try:
-        # 구어체 API를 먼저 시도하고, 실패하면 일반 API로 폴백
-        svo_list = extract_svo_korean_etri_spoken(text, api_key)
-        
-        if not svo_list:
-            # SRL이 없는 경우 dependency 정보를 활용한 간단한 SVO 추출
-            return extract_svo_from_dependency(text, api_key)
-        
-        # 첫 번째 SVO 결과 반환
-        first_svo = svo_list[0]
-        return {
-            "sentence": text,
-            "language": "ko",
-            "svo": {
-                "subject": first_svo.get("S", "주어"),
-                "verb": first_svo.get("V", "동사"),
-                "object": first_svo.get("O", "목적어")
-            }
-        }
-        
-    except Exception as e:
-        print(f"SVO 분석 오류: {e}")
-        # 오류 시 dependency 기반 추출 시도
-        try:
-            return extract_svo_from_dependency(text, api_key)
-        except:
-            # 최종 폴백
-            return {
-                "sentence": text,
-                "language": "ko",
-                "svo": {
-                    "subject": "주어",
-                    "verb": "동사",
-                    "object": "목적어"
-                }
-            }
-
-
-def extract_svo_from_dependency(text: str, api_key: str = None):
-    """dependency 정보를 활용한 SVO 추출"""
-    if api_key is None:
-        api_key = os.getenv("ETRI_API_KEY")
-        if api_key is None:
-            raise ValueError("ETRI API 키가 제공되지 않았습니다.")
-
-    headers = {
-        "Content-Type": "application/json; charset=UTF-8",
-        "Authorization": api_key
-    }
-
-    payload = {
-        "argument": {
-            "text": text,
-            "analysis_code": "srl"
-        }
-    }
-
-    response = requests.post(ETRI_API_URL, headers=headers, data=json.dumps(payload))
-    
-    if response.status_code != 200:
-        raise Exception(f"ETRI API 호출 실패: {response.status_code}")
-
-    data = response.json()
-    sentences = data.get("return_object", {}).get("sentence", [])
-    
-    if not sentences:
-        raise Exception("문장 정보를 찾을 수 없습니다.")
-    
-    sentence = sentences[0]
-    dependency = sentence.get("dependency", [])
-    morp = sentence.get("morp", [])
-    
-    # dependency에서 주어와 서술어 찾기
-    subject = ""
-    verb = ""
-    object_text = ""
-    
-    for dep in dependency:
-        if dep.get("label") == "NP_SBJ":  # 주어
-            subject = dep.get("text", "")
-        elif dep.get("label") == "VNP":  # 서술어
-            verb = dep.get("text", "")
-    
-    # 목적어는 간단히 추출 (실제로는 더 복잡한 로직 필요)
-    words = sentence.get("word", [])
-    for word in words:
-        if word.get("text") and word.get("text") not in subject and word.get("text") not in verb:
-            object_text = word.get("text", "")
-            break
-    
-    return {
-        "sentence": text,
-        "language": "ko",
-        "svo": {
-            "subject": subject if subject else "주어",
-            "verb": verb if verb else "동사",
-            "object": object_text if object_text else "목적어"
-        }
-    }
@@ -0,0 +1,139 @@
+# -*- coding:utf-8 -*-
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 규칙 기반 결과의 신뢰도가 이 값 이상이면 ETRI를 호출하지 않음
+SVO_KO_RULES_ENABLED = os.getenv("SVO_KO_RULES_ENABLED", "1") == "1"
+SVO_KO_RULES_THRESHOLD = float(os.getenv("SVO_KO_RULES_THRESHOLD", "0.8"))
+
+# 격조사: (조사, 앞 글자 받침 필요 여부, None이면 받침과 무관)
+SUBJECT_PARTICLES = [("께서", None), ("이", True), ("가", False)]
+TOPIC_PARTICLES = [("은", True), ("는", False)]
+OBJECT_PARTICLES = [("을", True), ("를", False)]
+
+# 문장을 끝맺는 서술어 어미 (평서/의문/청유/명령, 해요체/합쇼체 포함)
+VERB_ENDINGS = ("다", "요", "까", "죠", "네", "니", "냐", "자", "라", "어", "아", "지", "해", "야")
+
+# 본용언 + 보조용언(예: 배우고 있어요, 먹어 버렸다)은 두 어절을 하나의 서술어로 봄
+AUXILIARY_CONNECTORS = ("고", "어", "아", "여", "지", "게")
+AUXILIARY_STEMS = ("있", "계", "싶", "않", "못하", "버리", "버렸", "보", "봤", "주", "줬", "놓", "두")
+
+# 절을 잇는 연결 어미 -고, -며, -면서, -아서/-어서 (사서, 와서처럼 줄어든 형태 포함) → 서술어가 둘 이상인 문장
+CONNECTIVE_ENDINGS = ("고", "며", "면서", "서")
+# '서'로 끝나지만 연결 어미가 아닌 조사 (예: 학교에서, 친구에게서)
+LOCATIVE_PARTICLES = ("에서", "에게서", "한테서")
+
+# 받침이 있는 글자로 끝나지만 '이'가 조사가 아닌 자주 쓰이는 명사
+NOUNS_ENDING_IN_I = {"고양이", "원숭이", "송아지", "병아리", "종이", "놀이", "길이", "높이", "넓이", "깊이", "먹이"}
+
+PUNCTUATION = ".,!?~…\"'“”‘’()[]"
+
+
+def _has_batchim(char: str) -> bool:
+    code = ord(char) - 0xAC00
+    return 0 <= code < 11172 and code % 28 != 0
+
+
+def _is_hangul(char: str) -> bool:
+    return 0 <= ord(char) - 0xAC00 < 11172
+
+
+def _match_particle(word: str, particles):
+    """어절이 주어진 조사로 끝나고, 조사 앞 글자의 받침이 맞으면 True"""
+    for particle, needs_batchim in particles:
+        if not word.endswith(particle) or len(word) <= len(particle):
+            continue
+        stem_last = word[-len(particle) - 1]
+        if not _is_hangul(stem_last):
+            continue
+        if needs_batchim is None or _has_batchim(stem_last) == needs_batchim:
+            return True
+    return False
+
+
+def extract_svo_rules(text: str):
+    """
+    격조사(이/가, 을/를, 은/는)와 문장 끝 서술어 어미로 SVO를 추출합니다. (외부 호출 없음)
+    반환: {"S", "V", "O", "confidence"} (찾지 못한 성분은 빈 문자열, confidence: 0~1)
+    """
+    words = [w.strip(PUNCTUATION) for w in text.split()]
+    words = [w for w in words if w]
+    if not words:
+        return {"S": "", "V": "", "O": "", "confidence": 0.0}
+
+    verb = words[-1] if words[-1].endswith(VERB_ENDINGS) and _is_hangul(words[-1][-1]) else ""
+    candidates = words[:-1] if verb else words
+    if verb and candidates and candidates[-1].endswith(AUXILIARY_CONNECTORS) and verb.startswith(AUXILIARY_STEMS):
+        verb = f"{candidates[-1]} {verb}"
+        candidates = candidates[:-1]
+    subjects = [
+        (i, w) for i, w in enumerate(candidates)
+        if _match_particle(w, SUBJECT_PARTICLES) and w not in NOUNS_ENDING_IN_I
+    ]
+    topics = [(i, w) for i, w in enumerate(candidates) if _match_particle(w, TOPIC_PARTICLES)]
+    objects = [(i, w) for i, w in enumerate(candidates) if _match_particle(w, OBJECT_PARTICLES)]
+    connectives = [
+        i for i, w in enumerate(candidates)
+        if w.endswith(CONNECTIVE_ENDINGS) and _is_hangul(w[-1]) and not w.endswith(LOCATIVE_PARTICLES)
+        and not _match_particle(w, SUBJECT_PARTICLES + TOPIC_PARTICLES + OBJECT_PARTICLES)
+    ]
+
+    confidence = 1.0
+    if subjects:
+        subject_index, subject = subjects[0]
+    elif topics:
+        # 은/는은 주어가 아닌 주제일 수도 있음
+        subject_index, subject = topics[0]
+        confidence *= 0.85
+    else:
+        subject_index, subject = -1, ""
+        confidence *= 0.4
+    object_index, obj = objects[0] if objects else (-1, "")
+    if not obj:
+        confidence *= 0.5
+    if not verb:
+        confidence *= 0.5
+    # 후보가 여럿이면 관형절/인용절 등이 섞인 문장
+    if len(subjects) + len(topics) > 1 or len(objects) > 1:
+        confidence *= 0.7
+    if subject and obj and subject_index > object_index:
+        confidence *= 0.8
+    if connectives:
+        # 연결 어미로 이어진 절이 있으면 마지막 서술어가 문장 전체의 서술어라고 보기 어려움
+        confidence *= 0.5
+        if obj and object_index < connectives[-1]:
+            # 목적어가 앞 절의 서술어에 걸림 (예: 책을 읽고 집에 갔다 → 책을 ~ 읽고)
+            confidence *= 0.6
+    if len(words) > 6:
+        confidence *= 0.8
+
+    return {"S": subject, "V": verb, "O": obj, "confidence": round(confidence, 3)}
+
+
+if __name__ == "__main__":
+    for sentence in [
+        "학생이 책을 읽는다.",
+        "그는 나에게 선물을 주었다.",
+        "오늘 날씨가 정말 좋네요",
+        "윤동주는 한국의 독립운동가이자 시인이었다.",
+        "고양이를 개가 쫓는다.",
+    ]:
+        print(sentence, extract_svo_rules(sentence))
+
+    # 연결 어미로 이어진 문장은 규칙만으로 결정하지 않고 ETRI로 넘겨야 함
+    for sentence in [
+        "학생이 책을 읽고 집에 갔다.",
+        "학생이 음악을 들으며 공부했다.",
+        "아이가 사과를 먹으면서 웃었다.",
+        "동생이 빵을 사서 학교에 갔다.",
+        "친구가 밥을 먹어서 배가 부르다.",
+        "엄마가 시장에 가서 과일을 샀다.",
+    ]:
+        result = extract_svo_rules(sentence)
+        print(sentence, result)
+        assert result["confidence"] < SVO_KO_RULES_THRESHOLD, sentence
+    assert extract_svo_rules("학생이 책을 읽는다.")["confidence"] >= SVO_KO_RULES_THRESHOLD
+    assert extract_svo_rules("학생이 책을 읽고 있다.")["confidence"] >= SVO_KO_RULES_THRESHOLD
+    assert extract_svo_rules("학생이 도서관에서 책을 읽는다.")["confidence"] >= SVO_KO_RULES_THRESHOLD
@@ -0,0 +1,39 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from services.profiling import (
+    profiles, get_profile, PROFILE_TOKEN, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS
+)
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+def require_profile_token(x_profile_token: Optional[str] = Header(None)):
+    """X-Profile-Token 헤더가 PROFILE_TOKEN과 같아야 조회 가능"""
+    if not PROFILE_TOKEN or x_profile_token != PROFILE_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="프로파일 조회 권한이 없습니다.")
+
+
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+def list_profiles():
+    """최근 요청 프로파일 목록 (최신순)"""
+    return {
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "interval_ms": PROFILE_INTERVAL_MS,
+        "profiles": [profile.summary() for profile in reversed(profiles)]
+    }
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+def get_profile_detail(profile_id: str, format: str = Query("json", description="json 또는 folded")):
+    """
+    요청 하나의 프로파일
+    - json: 요약 + 단계별 처리 시간 + folded stack별 샘플 수
+    - folded: flamegraph.pl / speedscope에 바로 넣을 수 있는 텍스트
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다. (오래되어 밀려났을 수 있음)")
+    if format == "folded":
+        return PlainTextResponse(profile.folded())
+    return profile.to_dict()
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from auth.dependencies import get_current_user
 from typing import List
-from services.db import save_user_data, get_user_data, merge_guest_to_user_data
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.db import get_db, save_user_data, get_user_data, merge_guest_to_user_data
 
 router = APIRouter(prefix="/protected", tags=["protected"])
 
@@ -66,23 +67,23 @@ async def get_user_statistics(current_user: dict = Depends(get_current_user)):
     }
 
 @router.get("/user-data")
-async def get_user_data_api(current_user: dict = Depends(get_current_user)):
+async def get_user_data_api(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """현재 인증된 사용자의 데이터를 조회합니다."""
-    data = get_user_data(current_user['uid'])
+    data = await get_user_data(db, current_user['uid'])
     if data is None:
         raise HTTPException(status_code=404, detail="No data found for user.")
     return {"user_id": current_user['uid'], "data": data}
 
 @router.post("/user-data")
-async def save_user_data_api(request: UserDataRequest, current_user: dict = Depends(get_current_user)):
+async def save_user_data_api(request: UserDataRequest, current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """현재 인증된 사용자의 데이터를 저장합니다."""
-    saved = save_user_data(current_user['uid'], request.data)
+    saved = await save_user_data(db, current_user['uid'], request.data)
     return {"user_id": current_user['uid'], "data": request.data, "saved_at": str(saved.created_at)}
 
 @router.post("/merge-guest-data")
-async def merge_guest_data_api(request: MergeGuestDataRequest, current_user: dict = Depends(get_current_user)):
+async def merge_guest_data_api(request: MergeGuestDataRequest, current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """게스트 데이터를 현재 사용자 데이터로 merge합니다."""
-    merged = merge_guest_to_user_data(request.guest_id, current_user['uid'], request.merge_strategy)
+    merged = await merge_guest_to_user_data(db, request.guest_id, current_user['uid'], request.merge_strategy)
     if merged is None:
         raise HTTPException(status_code=404, detail="No guest data found to merge.")
     return {"user_id": current_user['uid'], "merged_data": merged.data, "merged_at": str(merged.created_at)}
@@ -1,18 +1,34 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from services.gpt import call_gpt
+from services.gpt import call_gpt_async, astream_gpt, rate_limiter, RATE_LIMIT_MESSAGE
+from services.gpt_cache import gpt_cache
+from services.singleflight import SingleFlight, flights
+from services.rate_limiter import RateLimitExceeded, PRIORITY_AUTHENTICATED, PRIORITY_ANONYMOUS
+from openai import RateLimitError
 from auth.dependencies import get_current_user_optional
+from auth.firebase_keys import key_store
 import sys
 import os
+import json
 
 # ai-engine 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-engine'))
-from preprocessing.svo_extractor import analyze_svo
-from services.db import save_svo_sentence, save_guest_data, get_guest_data
+from preprocessing.svo_extractor_ko import analyze_svo_ko_async, analyze_svo_ko_batch_async, etri_router, etri_cache, local_rules_stats
+from preprocessing.svo_extractor_en import parse_cache
+from preprocessing.model_manager import model_manager
+from preprocessing.sentence_splitter import IncrementalSentenceSplitter, to_structured_json
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.db import get_db, pool_stats, save_svo_sentence, save_guest_data, get_guest_data
 from services.google_search import google_search
+from services import svo_pool, auth_cache
+from services.svo_pool import analyze_svo_en_async, analyze_svo_en_batch_async, SVOPoolBusy
 
 router = APIRouter()
 
+# 같은 문장의 SVO 분석(ETRI/spaCy)이 동시에 몰리면 한 번만 실행
+svo_flight = SingleFlight("svo")
+
 class PromptRequest(BaseModel):
     prompt: str
 
@@ -20,34 +36,131 @@ class SVORequest(BaseModel):
     text: str
     language: str = "auto"  # auto, ko, en
 
+def _gpt_priority(current_user):
+    # 로그인 사용자의 OpenAI 호출을 속도 제한 대기열에서 먼저 처리
+    return PRIORITY_AUTHENTICATED if current_user else PRIORITY_ANONYMOUS
+
 @router.post("/analyze")
-def analyze(data: PromptRequest, current_user: dict = Depends(get_current_user_optional)):
+async def analyze(data: PromptRequest, current_user: dict = Depends(get_current_user_optional)):
     """AI 분석 엔드포인트 (인증 선택사항)"""
     user_info = current_user if current_user else {"uid": "anonymous", "email": "anonymous"}
     
     return {
-        "response": call_gpt(data.prompt),
+        "response": await call_gpt_async(data.prompt, priority=_gpt_priority(current_user)),
         "user": user_info,
         "authenticated": current_user is not None
     }
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/analyze/stream")
+async def analyze_stream(data: PromptRequest, current_user: dict = Depends(get_current_user_optional)):
+    """AI 분석 스트리밍 엔드포인트 (SSE, 인증 선택사항)
+    GPT 토큰을 받는 즉시 문장 단위로 분리해 완성된 문장마다 `sentence` 이벤트를 보냅니다."""
+    user_info = current_user if current_user else {"uid": "anonymous", "email": "anonymous"}
+
+    async def event_stream():
+        splitter = IncrementalSentenceSplitter()
+        count = 0
+        try:
+            async for token in astream_gpt(data.prompt, priority=_gpt_priority(current_user)):
+                for sentence in splitter.feed(token):
+                    count += 1
+                    yield _sse_event("sentence", sentence)
+            for sentence in splitter.flush():
+                count += 1
+                yield _sse_event("sentence", sentence)
+        except (RateLimitError, RateLimitExceeded) as e:
+            print(f"상세 오류: {e}")
+            yield _sse_event("error", {"message": RATE_LIMIT_MESSAGE})
+            return
+        except Exception as e:
+            print(f"상세 오류: {e}")
+            yield _sse_event("error", {"message": f"오류가 발생했습니다: {str(e)}"})
+            return
+        yield _sse_event("done", {
+            "sentence_count": count,
+            "user": user_info,
+            "authenticated": current_user is not None
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """GPT 응답 캐시/영어 파싱 캐시/ETRI 결과 캐시 적중률, 동시 호출 병합(single-flight), OpenAI 속도 제한 대기열, DB 커넥션 풀 통계를 반환합니다."""
+    return {
+        "gpt": gpt_cache.stats(),
+        "svo_en_parse": parse_cache.stats(),
+        "svo_ko_etri": etri_cache.stats(),
+        "auth": auth_cache.stats(),
+        "firebase_keys": key_store.stats(),
+        "db_pool": pool_stats(),
+        "openai_rate_limiter": rate_limiter.stats(),
+        "singleflight": {name: flight.stats() for name, flight in flights.items()}
+    }
+
+def _detect_language(text: str) -> str:
+    # 간단한 한국어 감지
+    if any('\u3131' <= char <= '\u3163' or '\uac00' <= char <= '\ud7af' for char in text):
+        return "ko"
+    return "en"
+
 @router.post("/svo")
-def svo_analysis(data: SVORequest):
+async def svo_analysis(data: SVORequest):
     try:
         # 언어 자동 감지
         if data.language == "auto":
-            # 간단한 한국어 감지
-            if any('\u3131' <= char <= '\u3163' or '\uac00' <= char <= '\ud7af' for char in data.text):
-                data.language = "ko"
-            else:
-                data.language = "en"
+            data.language = _detect_language(data.text)
         
-        # SVO 분석 실행
-        result = analyze_svo(data.text, data.language)
+        # SVO 분석 실행 (영어: 파싱 전용 워커 프로세스, 한국어: ETRI 비동기 호출 한 번)
+        key = (data.language, data.text)
+        if data.language == "ko":
+            result = await svo_flight.do_async(key, analyze_svo_ko_async, data.text)
+        else:
+            result = await svo_flight.do_async(key, analyze_svo_en_async, data.text)
         return result
+    except SVOPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return {"error": str(e)}
 
+@router.post("/svo/batch")
+async def svo_batch_analysis(data: SVORequest):
+    """텍스트를 문장 단위로 나눈 뒤 모든 문장의 SVO를 한 번에 분석합니다. (영어는 nlp.pipe 배치 파싱)"""
+    try:
+        if data.language == "auto":
+            data.language = _detect_language(data.text)
+
+        structured = to_structured_json(data.text)
+        if data.language == "ko":
+            results = await analyze_svo_ko_batch_async(structured["sentences"])
+        else:
+            results = await analyze_svo_en_batch_async(structured["sentences"])
+        for sentence, result in zip(structured["sentences"], results):
+            sentence["svo"] = result["svo"]
+        structured["language"] = data.language
+        return structured
+    except SVOPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.get("/svo/models")
+def get_svo_models():
+    """spaCy 모델 로드 상태(모델명, 파이프라인, 로드 시간, 메모리 사용량), SVO 워커 풀 상태, ETRI 엔드포인트별 상태, 한국어 규칙 기반 처리 건수를 반환합니다."""
+    return {
+        "models": model_manager.stats(),
+        "worker_pool": svo_pool.stats(),
+        "etri": etri_router.stats(),
+        "svo_ko_rules": local_rules_stats()
+    }
+
 # 구조문장 저장 API
 class SVOSaveRequest(BaseModel):
     text: str
@@ -55,9 +168,9 @@ class SVOSaveRequest(BaseModel):
     result: str
 
 @router.post("/save_svo")
-def save_svo(data: SVOSaveRequest):
+async def save_svo(data: SVOSaveRequest, db: AsyncSession = Depends(get_db)):
     try:
-        svo = save_svo_sentence(data.text, data.language, data.result)
+        svo = await save_svo_sentence(db, data.text, data.language, data.result)
         return {"id": svo.id, "text": svo.text, "language": svo.language, "result": svo.result}
     except Exception as e:
         return {"error": str(e)}
@@ -95,15 +208,15 @@ class GuestDataRequest(BaseModel):
     data: dict
 
 @router.post("/guest-data")
-def save_guest_data_api(request: GuestDataRequest):
+async def save_guest_data_api(request: GuestDataRequest, db: AsyncSession = Depends(get_db)):
     """게스트(비로그인) 사용자의 데이터를 임시 저장합니다."""
-    saved = save_guest_data(request.guest_id, request.data)
+    saved = await save_guest_data(db, request.guest_id, request.data)
     return {"guest_id": request.guest_id, "data": request.data, "saved_at": str(saved.created_at)}
 
 @router.get("/guest-data")
-def get_guest_data_api(guest_id: str = Query(..., description="게스트 식별자(UUID 등)")):
+async def get_guest_data_api(guest_id: str = Query(..., description="게스트 식별자(UUID 등)"), db: AsyncSession = Depends(get_db)):
     """게스트(비로그인) 사용자의 데이터를 조회합니다."""
-    data = get_guest_data(guest_id)
+    data = await get_guest_data(db, guest_id)
     if data is None:
         return {"guest_id": guest_id, "data": None, "message": "No data found for guest."}
     return {"guest_id": guest_id, "data": data}
@@ -1,20 +1,14 @@
 from fastapi import APIRouter, Depends
-from auth.dependencies import get_current_user
-from db import get_db_connection
+from fastapi.concurrency import run_in_threadpool
+from auth.dependencies import get_current_user_profile
+from db import upsert_user
 
 router = APIRouter()
 
 @router.post("/save-user")
-async def save_user(current_user: dict = Depends(get_current_user)):
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE uid = %s", (current_user['uid'],))
-    if cur.fetchone() is None:
-        cur.execute(
-            "INSERT INTO users (email, uid, display_name) VALUES (%s, %s, %s)",
-            (current_user['email'], current_user['uid'], current_user['display_name'])
-        )
-        conn.commit()
-    cur.close()
-    conn.close()
-    return {"success": True} 
\ No newline at end of file
+async def save_user(current_user: dict = Depends(get_current_user_profile)):
+    # psycopg2는 동기 드라이버이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await run_in_threadpool(
+        upsert_user, current_user['uid'], current_user['email'], current_user['display_name']
+    )
+    return {"success": True}
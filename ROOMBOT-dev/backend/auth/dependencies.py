@@ -1,22 +1,59 @@
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from config.firebase_config import verify_firebase_token, get_user_by_uid
+from services import auth_cache
 import firebase_admin
 from firebase_admin import auth
 
 # HTTP Bearer 토큰 스키마
 security = HTTPBearer()
+# 인증 선택 엔드포인트용 (Authorization 헤더가 없어도 403 대신 None)
+optional_security = HTTPBearer(auto_error=False)
+
+def _unauthorized():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="유효하지 않은 인증 토큰",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _user_from_claims(decoded_token: dict):
+    """ID 토큰 claims로 사용자 정보 구성 (Firebase 호출 없음, 토큰 발급 시점의 프로필)"""
+    return {
+        'uid': decoded_token['uid'],
+        'email': decoded_token.get('email'),
+        'display_name': decoded_token.get('name'),
+        'photo_url': decoded_token.get('picture'),
+        'email_verified': decoded_token.get('email_verified', False)
+    }
+
+async def _verify_token(id_token: str):
+    """검증된 토큰 캐시를 먼저 보고, 없으면 Firebase로 검증 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    decoded_token = auth_cache.get_verified_token(id_token)
+    if decoded_token is not None:
+        return decoded_token
+    decoded_token = await run_in_threadpool(verify_firebase_token, id_token)
+    auth_cache.set_verified_token(id_token, decoded_token)
+    return decoded_token
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """현재 인증된 사용자를 가져옵니다."""
+    """현재 인증된 사용자를 가져옵니다. (토큰 claims 기준, 같은 토큰은 exp까지 캐시)"""
+    try:
+        decoded_token = await _verify_token(credentials.credentials)
+    except Exception:
+        raise _unauthorized()
+    return _user_from_claims(decoded_token)
+
+async def get_current_user_profile(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Firebase에 저장된 최신 프로필이 필요한 경우의 사용자 정보
+    (DB에 저장할 값이므로 캐시하지 않고 매번 Firebase에서 조회)
+    """
     try:
-        # Firebase ID 토큰 검증
-        decoded_token = verify_firebase_token(credentials.credentials)
-        uid = decoded_token['uid']
-        
+        decoded_token = await _verify_token(credentials.credentials)
         # 사용자 정보 가져오기
-        user = get_user_by_uid(uid)
-        
+        user = await run_in_threadpool(get_user_by_uid, decoded_token['uid'])
         return {
             'uid': user.uid,
             'email': user.email,
@@ -24,16 +61,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             'photo_url': user.photo_url,
             'email_verified': user.email_verified
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="유효하지 않은 인증 토큰",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    except Exception:
+        raise _unauthorized()
 
-async def get_current_user_optional(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user_optional(credentials: HTTPAuthorizationCredentials = Depends(optional_security)):
     """선택적으로 현재 인증된 사용자를 가져옵니다. (인증이 실패해도 None 반환)"""
+    if credentials is None:
+        return None
     try:
         return await get_current_user(credentials)
     except HTTPException:
-        return None 
\ No newline at end of file
+        return None
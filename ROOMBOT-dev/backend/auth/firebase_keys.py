@@ -0,0 +1,158 @@
+import os
+import re
+import time
+import asyncio
+import threading
+import requests
+from dotenv import load_dotenv
+from jose import jwt, jwk
+from jose.exceptions import JOSEError
+
+load_dotenv()
+
+# Firebase ID 토큰 서명 인증서 (kid → X.509 PEM), 응답의 Cache-Control max-age 동안 유효
+FIREBASE_CERTS_URL = os.getenv(
+    "FIREBASE_CERTS_URL",
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+FIREBASE_KEYS_PREFETCH = os.getenv("FIREBASE_KEYS_PREFETCH", "1") == "1"
+FIREBASE_KEYS_TIMEOUT = float(os.getenv("FIREBASE_KEYS_TIMEOUT", "5"))  # 초
+# max-age가 끝나기 이 시간(초) 전에 미리 갱신
+FIREBASE_KEYS_REFRESH_MARGIN = float(os.getenv("FIREBASE_KEYS_REFRESH_MARGIN", "300"))
+FIREBASE_KEYS_RETRY = float(os.getenv("FIREBASE_KEYS_RETRY", "30"))  # 갱신 실패 시 재시도 간격(초)
+FIREBASE_CLOCK_SKEW_SECONDS = int(os.getenv("FIREBASE_CLOCK_SKEW_SECONDS", "0"))
+
+DEFAULT_MAX_AGE = 3600
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class FirebaseKeyStore:
+    """
+    Firebase 서명 인증서를 메모리에 두고 백그라운드에서 갱신
+    - 앱 시작 시 미리 받아두고, max-age가 끝나기 전에 다시 받음 (요청 처리 중에는 다운로드하지 않음)
+    - 갱신에 실패하면 기존 키를 계속 사용하며 FIREBASE_KEYS_RETRY 간격으로 재시도
+    """
+
+    def __init__(self, url: str = FIREBASE_CERTS_URL):
+        self.url = url
+        self._keys = {}  # kid -> jose Key (인증서 파싱은 갱신할 때 한 번만)
+        self._lock = threading.Lock()
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self.refreshes = 0
+        self.failures = 0
+        self._task = None
+        self._wakeup = None
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._keys)
+
+    def get(self, kid: str):
+        return self._keys.get(kid)
+
+    def refresh(self) -> float:
+        """인증서를 받아 교체하고, 다음 갱신까지 남은 시간(초)을 반환합니다."""
+        response = requests.get(self.url, timeout=FIREBASE_KEYS_TIMEOUT)
+        response.raise_for_status()
+        keys = {kid: jwk.construct(pem, "RS256") for kid, pem in response.json().items()}
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+        now = time.time()
+        with self._lock:
+            self._keys = keys
+            self.fetched_at = now
+            self.expires_at = now + max_age
+            self.refreshes += 1
+        return max_age
+
+    def _next_delay(self) -> float:
+        return max(FIREBASE_KEYS_RETRY, self.expires_at - time.time() - FIREBASE_KEYS_REFRESH_MARGIN)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._refresh_async()
+
+    async def _refresh_async(self):
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            self.failures += 1
+            print(f"Firebase 서명 키 갱신 실패: {e}")
+
+    async def start(self):
+        """앱 시작 시 키를 받아두고 백그라운드 갱신을 시작합니다."""
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        await self._refresh_async()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def request_refresh(self):
+        """모르는 kid가 들어오면 (키 교체 직후) 다음 갱신을 앞당김 (대기하지 않음)"""
+        if self._task is None or time.time() - self.fetched_at < FIREBASE_KEYS_RETRY:
+            return
+        self._task.get_loop().call_soon_threadsafe(self._wakeup.set)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "keys": len(self._keys),
+            "fetched_at": self.fetched_at,
+            "expires_in": round(self.expires_at - time.time(), 1) if self.expires_at else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "background": self._task is not None
+        }
+
+
+key_store = FirebaseKeyStore()
+
+
+def verify_id_token_locally(id_token: str, project_id: str) -> dict:
+    """
+    메모리에 있는 서명 키로 Firebase ID 토큰을 검증합니다. (네트워크 호출 없음)
+    검증 항목은 Firebase Admin SDK와 같음: RS256 서명, aud, iss, exp/iat, sub, auth_time
+    """
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except JOSEError as e:
+        raise ValueError(f"ID 토큰 형식 오류: {e}")
+    if header.get("alg") != "RS256":
+        raise ValueError("ID 토큰의 서명 알고리즘이 RS256이 아닙니다.")
+    key = key_store.get(header.get("kid"))
+    if key is None:
+        key_store.request_refresh()
+        raise ValueError("ID 토큰의 kid에 맞는 서명 키가 없습니다.")
+
+    issuer = f"https://securetoken.google.com/{project_id}"
+    try:
+        claims = jwt.decode(
+            id_token, key, algorithms=["RS256"], audience=project_id, issuer=issuer,
+            options={"leeway": FIREBASE_CLOCK_SKEW_SECONDS, "require_exp": True, "require_iat": True}
+        )
+    except JOSEError as e:
+        raise ValueError(f"ID 토큰 검증 실패: {e}")
+
+    now = time.time() + FIREBASE_CLOCK_SKEW_SECONDS
+    subject = claims.get("sub")
+    if not isinstance(subject, str) or not subject or len(subject) > 128:
+        raise ValueError("ID 토큰의 sub가 올바르지 않습니다.")
+    if claims["iat"] > now or claims.get("auth_time", 0) > now:
+        raise ValueError("ID 토큰이 미래 시각에 발급되었습니다.")
+    claims["uid"] = subject
+    return claims
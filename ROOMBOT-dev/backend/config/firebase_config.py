@@ -1,6 +1,8 @@
 import firebase_admin
 from firebase_admin import credentials, auth
 import os
+from services.metrics import instrument
+from auth.firebase_keys import key_store, verify_id_token_locally
 
 # Firebase Admin SDK 초기화
 def initialize_firebase():
@@ -13,25 +15,48 @@ def initialize_firebase():
         # 실제 서비스 계정 키 파일 경로로 변경 필요
         service_account_path = os.getenv('FIREBASE_SERVICE_ACCOUNT_PATH', 'path/to/serviceAccountKey.json')
         
-        if os.path.exists(service_account_path):
+        if os.getenv('FIREBASE_AUTH_EMULATOR_HOST'):
+            # Auth 에뮬레이터(또는 loadtest/stub_server.py) 사용 시 서비스 계정 없이 프로젝트 ID만 지정
+            firebase_admin.initialize_app(options={'projectId': os.getenv('FIREBASE_PROJECT_ID', 'demo-roombot')})
+        elif os.path.exists(service_account_path):
             cred = credentials.Certificate(service_account_path)
             firebase_admin.initialize_app(cred)
         else:
             # 개발 환경에서는 기본 설정 사용
             firebase_admin.initialize_app()
 
+def get_project_id():
+    """ID 토큰의 aud/iss 검증에 쓰는 Firebase 프로젝트 ID (모르면 None)"""
+    project_id = os.getenv('FIREBASE_PROJECT_ID')
+    if project_id:
+        return project_id
+    initialize_firebase()
+    return firebase_admin.get_app().project_id
+
 # Firebase Auth 관련 함수들
+@instrument("firebase.verify_firebase_token")
 def verify_firebase_token(id_token):
-    """Firebase ID 토큰을 검증합니다."""
+    """
+    Firebase ID 토큰을 검증합니다.
+    서명 키를 미리 받아둔 경우(auth/firebase_keys.py) 요청 중 네트워크 호출 없이 로컬에서 검증하고,
+    에뮬레이터 모드이거나 키가 없으면 Firebase Admin SDK로 검증
+    """
     try:
+        if key_store.loaded and not os.getenv('FIREBASE_AUTH_EMULATOR_HOST'):
+            project_id = get_project_id()
+            if project_id:
+                return verify_id_token_locally(id_token, project_id)
+        initialize_firebase()
         decoded_token = auth.verify_id_token(id_token)
         return decoded_token
     except Exception as e:
         raise Exception(f"토큰 검증 실패: {str(e)}")
 
+@instrument("firebase.get_user_by_uid")
 def get_user_by_uid(uid):
     """UID로 사용자 정보를 가져옵니다."""
     try:
+        initialize_firebase()
         user = auth.get_user(uid)
         return user
     except Exception as e:
@@ -40,6 +65,7 @@ def get_user_by_uid(uid):
 def create_custom_token(uid):
     """커스텀 토큰을 생성합니다."""
     try:
+        initialize_firebase()
         custom_token = auth.create_custom_token(uid)
         return custom_token
     except Exception as e:
@@ -1,10 +1,110 @@
-import psycopg2
+import os
+import threading
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+from dotenv import load_dotenv
+from services.metrics import instrument, track
 
+load_dotenv()
+
+# users 테이블용 공유 커넥션 풀 (요청마다 psycopg2.connect 하지 않음)
+USERS_DB_NAME = os.getenv("USERS_DB_NAME", "postgres")
+USERS_DB_USER = os.getenv("USERS_DB_USER", "jiyu")
+USERS_DB_PASSWORD = os.getenv("USERS_DB_PASSWORD", "")
+USERS_DB_HOST = os.getenv("USERS_DB_HOST", "localhost")
+USERS_DB_POOL_MIN = int(os.getenv("USERS_DB_POOL_MIN", "1"))
+USERS_DB_POOL_MAX = int(os.getenv("USERS_DB_POOL_MAX", "10"))
+# 풀이 모두 사용 중일 때 커넥션을 기다리는 시간(초)
+USERS_DB_POOL_TIMEOUT = float(os.getenv("USERS_DB_POOL_TIMEOUT", "10"))
+
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool은 가득 차면 바로 PoolError를 내므로, 빈 커넥션이 생길 때까지 대기하도록 제한
+_slots = threading.BoundedSemaphore(USERS_DB_POOL_MAX)
+
+
+def _ensure_schema(conn):
+    # ON CONFLICT (uid)에 필요한 unique index (이미 중복된 uid가 있으면 생성 실패 → 정리 후 재시작)
+    with conn.cursor() as cur:
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_uid_key ON users (uid)")
+    conn.commit()
+
+
+def get_pool():
+    """처음 호출할 때 커넥션 풀을 만들고 users(uid) unique index를 확인합니다."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ThreadedConnectionPool(
+                    USERS_DB_POOL_MIN, USERS_DB_POOL_MAX,
+                    dbname=USERS_DB_NAME,
+                    user=USERS_DB_USER,
+                    password=USERS_DB_PASSWORD,
+                    host=USERS_DB_HOST
+                )
+                try:
+                    conn = pool.getconn()
+                    try:
+                        _ensure_schema(conn)
+                    finally:
+                        pool.putconn(conn)
+                except Exception:
+                    # 다음 호출에서 다시 만들 수 있도록 열어둔 커넥션을 모두 닫음
+                    pool.closeall()
+                    raise
+                _pool = pool
+    return _pool
+
+
+@contextmanager
 def get_db_connection():
-    conn = psycopg2.connect(
-        dbname="postgres",
-        user="jiyu",
-        password="",
-        host="localhost"
-    )
-    return conn 
\ No newline at end of file
+    """풀에서 커넥션을 빌려주고, 끝나면 반환 (예외 시 rollback, 끊긴 커넥션은 버림)"""
+    pool = get_pool()
+    with track("db.users_pool.acquire"):
+        if not _slots.acquire(timeout=USERS_DB_POOL_TIMEOUT):
+            raise TimeoutError("users DB 커넥션 풀 대기 시간 초과")
+        try:
+            conn = pool.getconn()
+        except Exception:
+            _slots.release()
+            raise
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+        _slots.release()
+
+
+def close_pool():
+    """앱 종료 시 풀의 커넥션을 모두 닫습니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+@instrument("db.upsert_user")
+def upsert_user(uid: str, email: str, display_name: str):
+    """
+    로그인한 사용자를 users 테이블에 저장 (한 번의 왕복, 동시 로그인에도 중복 행 없음)
+    이미 있으면 email/display_name이 바뀐 경우에만 갱신
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO users (email, uid, display_name) VALUES (%s, %s, %s)
+                ON CONFLICT (uid) DO UPDATE
+                SET email = EXCLUDED.email, display_name = EXCLUDED.display_name
+                WHERE users.email IS DISTINCT FROM EXCLUDED.email
+                   OR users.display_name IS DISTINCT FROM EXCLUDED.display_name
+                """,
+                (email, uid, display_name)
+            )
+        conn.commit()
@@ -1,8 +1,20 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from api.routes import router
 from api.auth_routes import router as auth_router
 from api.protected_routes import router as protected_router
+from api.debug_routes import router as debug_router
+from services.gpt import close_async_client
+from preprocessing.model_manager import model_manager
+from services.svo_pool import start_pool, shutdown_pool
+from services.db import close_async_engine
+from db import close_pool
+from preprocessing.etri_client import get_etri_client
+from auth.firebase_keys import key_store, FIREBASE_KEYS_PREFETCH
+from services.metrics import MetricsMiddleware, METRICS_ENABLED, CONTENT_TYPE, render_metrics
+from services.profiling import RequestTimingMiddleware, SERVER_TIMING_ENABLED, PROFILE_ENABLED
 
 app = FastAPI()
 
@@ -13,8 +25,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id"],
 )
 
+# 요청별 단계 처리 시간(Server-Timing 헤더) + 요청 프로파일링(PROFILE_ENABLED=1일 때, X-Profile 헤더 또는 PROFILE_SAMPLE_RATE)
+if SERVER_TIMING_ENABLED or PROFILE_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+
+# 라우트별 요청 수/처리 시간 + 단계별(OpenAI, ETRI, spaCy, Google, Firebase, DB) 측정 (METRICS_ENABLED=0이면 끔)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(router)
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(protected_router, prefix="/protected", tags=["protected"])
+if PROFILE_ENABLED:
+    app.include_router(debug_router)
+
+
+@app.get("/health")
+def health():
+    """로드 밸런서/부하 테스트용 상태 확인"""
+    return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus 수집용 메트릭 (text format)"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
+@app.on_event("startup")
+def startup():
+    # SPACY_WARMUP=en 처럼 지정한 언어의 spaCy 모델을 첫 요청 전에 미리 로드
+    langs = [lang.strip() for lang in os.getenv("SPACY_WARMUP", "").split(",") if lang.strip()]
+    if langs:
+        model_manager.warmup(langs)
+    # 영어 SVO 파싱 전용 워커 프로세스 시작 (SVO_WORKERS=0이면 사용 안 함)
+    start_pool()
+
+
+@app.on_event("startup")
+async def start_firebase_keys():
+    # Firebase ID 토큰 서명 키를 미리 받아두고 만료 전에 백그라운드에서 갱신 (에뮬레이터 모드에서는 SDK 검증 사용)
+    if FIREBASE_KEYS_PREFETCH and not os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        await key_store.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await key_store.stop()
+    # 공유 OpenAI 비동기 클라이언트의 커넥션 풀 정리
+    await close_async_client()
+    await get_etri_client().aclose()
+    await close_async_engine()
+    close_pool()
+    shutdown_pool()
@@ -0,0 +1,42 @@
+import os
+import time
+import hashlib
+from dotenv import load_dotenv
+from services.cache import TTLCache
+
+load_dotenv()
+
+# 검증된 ID 토큰 캐시 (토큰 해시 → decoded claims, 토큰의 exp까지 유지)
+AUTH_TOKEN_CACHE_ENABLED = os.getenv("AUTH_TOKEN_CACHE_ENABLED", "1") == "1"
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# exp 직전에 만료된 토큰을 쓰지 않도록 남겨두는 여유(초)
+AUTH_TOKEN_CACHE_LEEWAY = float(os.getenv("AUTH_TOKEN_CACHE_LEEWAY", "5"))
+
+token_cache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE)
+
+
+def token_key(id_token: str) -> str:
+    # 토큰 원문을 메모리 키로 두지 않도록 해시 사용
+    return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+
+def get_verified_token(id_token: str):
+    """캐시에 있는 검증된 토큰의 claims (없거나 만료되었으면 None)"""
+    if not AUTH_TOKEN_CACHE_ENABLED:
+        return None
+    return token_cache.get(token_key(id_token))
+
+
+def set_verified_token(id_token: str, decoded_token: dict):
+    """검증에 성공한 토큰을 exp까지 캐시 (exp가 없거나 이미 지났으면 저장하지 않음)"""
+    if not AUTH_TOKEN_CACHE_ENABLED:
+        return
+    ttl = decoded_token.get("exp", 0) - time.time() - AUTH_TOKEN_CACHE_LEEWAY
+    if ttl > 0:
+        token_cache.set(token_key(id_token), decoded_token, ttl=ttl)
+
+
+def stats() -> dict:
+    return {
+        "tokens": token_cache.stats()
+    }
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 캐시 구현은 ai-engine의 preprocessing/lru_cache.py 하나만 사용 (백엔드에서는 TTLCache 이름으로)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-engine'))
+from preprocessing.lru_cache import LRUCache as TTLCache
@@ -1,17 +1,108 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime
+from sqlalchemy import create_engine, event, select, Column, Integer, String, Text, DateTime
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from datetime import datetime
 import json
+from services.metrics import instrument, Gauge, Counter, METRICS_ENABLED
 
 # 환경변수 또는 직접 입력
 POSTGRES_URL = os.getenv('POSTGRES_URL', 'postgresql://jang-yunjeong@localhost:5432/postgres')
 
-engine = create_engine(POSTGRES_URL)
+# 커넥션 풀 크기 (엔진별, 워커 프로세스마다 따로 잡히므로 Postgres max_connections를 넘지 않게 설정)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # 풀이 가득 찼을 때 커넥션 대기 시간(초)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # 오래된 커넥션 재연결(초)
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+
+
+def _sync_url(url: str) -> str:
+    """드라이버가 없는 postgresql:// URL은 psycopg2로 고정 (SQLAlchemy 2.1부터 기본 드라이버가 psycopg 3)"""
+    url = make_url(url)
+    if url.drivername == 'postgresql':
+        url = url.set(drivername='postgresql+psycopg2')
+    return url.render_as_string(hide_password=False)
+
+
+def _async_url(url: str) -> str:
+    """동기 URL을 비동기 드라이버 URL로 (postgresql → asyncpg, sqlite → aiosqlite)"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == 'postgresql':
+        url = url.set(drivername='postgresql+asyncpg')
+    elif backend == 'sqlite':
+        url = url.set(drivername='sqlite+aiosqlite')
+    return url.render_as_string(hide_password=False)
+
+
+# 비동기 엔진용 URL (지정하지 않으면 POSTGRES_URL에서 변환)
+ASYNC_POSTGRES_URL = os.getenv('ASYNC_POSTGRES_URL') or _async_url(POSTGRES_URL)
+
+_pool_options = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# 동기 엔진: 테이블 생성, 스레드에서 실행되는 GPT 영구 캐시용
+engine = create_engine(_sync_url(POSTGRES_URL), **_pool_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 비동기 엔진: 라우트에서 쓰는 사용자/게스트/SVO 데이터용 (이벤트 루프를 막지 않음)
+async_engine = create_async_engine(ASYNC_POSTGRES_URL, **_pool_options)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
+DB_POOL_MAX = Gauge("roombot_db_pool_max_connections", "커넥션 풀 최대 크기 (pool_size + max_overflow)", ("engine",))
+DB_POOL_CHECKED_OUT = Gauge("roombot_db_pool_checked_out", "사용 중인 DB 커넥션 수", ("engine",))
+DB_POOL_CONNECTIONS = Counter("roombot_db_pool_connections_total", "새로 연결한 DB 커넥션 수", ("engine",))
+DB_POOL_INVALIDATED = Counter("roombot_db_pool_invalidated_total", "끊겨서 버린 DB 커넥션 수", ("engine",))
+
+
+def _register_pool_metrics(sync_engine, name: str):
+    """풀 이벤트로 커넥션 사용량을 메트릭에 반영"""
+    DB_POOL_MAX.set(DB_POOL_SIZE + DB_MAX_OVERFLOW, name)
+    event.listen(sync_engine, 'connect', lambda *args: DB_POOL_CONNECTIONS.inc(name))
+    event.listen(sync_engine, 'checkout', lambda *args: DB_POOL_CHECKED_OUT.inc(name))
+    event.listen(sync_engine, 'checkin', lambda *args: DB_POOL_CHECKED_OUT.dec(name))
+    event.listen(sync_engine, 'invalidate', lambda *args: DB_POOL_INVALIDATED.inc(name))
+
+
+if METRICS_ENABLED:
+    _register_pool_metrics(engine, 'sync')
+    _register_pool_metrics(async_engine.sync_engine, 'async')
+
+
+async def get_db():
+    """
+    요청 단위 AsyncSession (FastAPI 의존성)
+    커넥션은 첫 쿼리 때 풀에서 가져오고 commit 또는 요청 종료 시 반환
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def close_async_engine():
+    await async_engine.dispose()
+
+
+def pool_stats() -> dict:
+    """엔진별 커넥션 풀 상태"""
+    return {
+        name: {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "max": DB_POOL_SIZE + DB_MAX_OVERFLOW
+        }
+        for name, pool in (("sync", engine.pool), ("async", async_engine.pool))
+        if hasattr(pool, "checkedout")
+    }
+
 class SVOSentence(Base):
     __tablename__ = 'svo_sentences'
     id = Column(Integer, primary_key=True, index=True)
@@ -33,74 +124,98 @@ class GuestData(Base):
     data = Column(Text, nullable=False)  # JSON 직렬화된 데이터
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class GPTCacheEntry(Base):
+    __tablename__ = 'gpt_response_cache'
+    key = Column(String(64), primary_key=True)  # 정규화된 프롬프트 + 모델 설정 해시
+    prompt = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True, nullable=False)
+
 
 # 테이블 생성
 Base.metadata.create_all(bind=engine)
 
-def save_svo_sentence(text: str, language: str, result: str):
-    db = SessionLocal()
+@instrument("db.save_svo_sentence")
+async def save_svo_sentence(db: AsyncSession, text: str, language: str, result: str):
     svo = SVOSentence(text=text, language=language, result=result)
     db.add(svo)
-    db.commit()
-    db.refresh(svo)
-    db.close()
+    await db.commit()
     return svo
 
-def save_user_data(user_id: str, data: dict):
-    db = SessionLocal()
+@instrument("db.save_user_data")
+async def save_user_data(db: AsyncSession, user_id: str, data: dict):
+    # id, created_at은 flush 때 채워지므로 commit 후 다시 조회(refresh)하지 않음
     user_data = UserData(user_id=user_id, data=json.dumps(data))
     db.add(user_data)
-    db.commit()
-    db.refresh(user_data)
-    db.close()
+    await db.commit()
     return user_data
 
-def get_user_data(user_id: str):
-    db = SessionLocal()
-    user_data = db.query(UserData).filter(UserData.user_id == user_id).order_by(UserData.created_at.desc()).first()
-    db.close()
-    if user_data:
-        return json.loads(user_data.data)
+@instrument("db.get_user_data")
+async def get_user_data(db: AsyncSession, user_id: str):
+    data = await db.scalar(
+        select(UserData.data).where(UserData.user_id == user_id).order_by(UserData.created_at.desc()).limit(1)
+    )
+    if data:
+        return json.loads(data)
     return None
 
-def save_guest_data(guest_id: str, data: dict):
-    db = SessionLocal()
+@instrument("db.save_guest_data")
+async def save_guest_data(db: AsyncSession, guest_id: str, data: dict):
     guest_data = GuestData(guest_id=guest_id, data=json.dumps(data))
     db.add(guest_data)
-    db.commit()
-    db.refresh(guest_data)
-    db.close()
+    await db.commit()
     return guest_data
 
 
-def get_guest_data(guest_id: str):
+@instrument("db.get_guest_data")
+async def get_guest_data(db: AsyncSession, guest_id: str):
+    data = await db.scalar(
+        select(GuestData.data).where(GuestData.guest_id == guest_id).order_by(GuestData.created_at.desc()).limit(1)
+    )
+    if data:
+        return json.loads(data)
+    return None
+
+@instrument("db.get_gpt_cache_entry")
+def get_gpt_cache_entry(key: str):
     db = SessionLocal()
-    guest_data = db.query(GuestData).filter(GuestData.guest_id == guest_id).order_by(GuestData.created_at.desc()).first()
+    entry = db.query(GPTCacheEntry).filter(GPTCacheEntry.key == key, GPTCacheEntry.expires_at > datetime.utcnow()).first()
     db.close()
-    if guest_data:
-        return json.loads(guest_data.data)
+    if entry:
+        return entry.response
     return None
 
-def merge_guest_to_user_data(guest_id: str, user_id: str, merge_strategy: str = 'replace'):
+@instrument("db.save_gpt_cache_entry")
+def save_gpt_cache_entry(key: str, prompt: str, response: str, expires_at: datetime):
+    db = SessionLocal()
+    # 같은 키가 이미 있으면 덮어씀
+    db.merge(GPTCacheEntry(key=key, prompt=prompt, response=response, created_at=datetime.utcnow(), expires_at=expires_at))
+    db.commit()
+    db.close()
+
+@instrument("db.merge_guest_to_user_data")
+async def merge_guest_to_user_data(db: AsyncSession, guest_id: str, user_id: str, merge_strategy: str = 'replace'):
     """
     게스트 데이터를 사용자 데이터로 이전(merge)합니다.
     merge_strategy: 'replace' (기존 사용자 데이터 덮어씀), 'append' (리스트 등일 때 합침) 등 확장 가능
+    (조회와 저장은 요청의 같은 세션에서 실행)
     """
-    guest_data = get_guest_data(guest_id)
+    guest_data = await get_guest_data(db, guest_id)
     if guest_data is None:
         return None
     if merge_strategy == 'replace':
         # 기존 사용자 데이터 무시, 게스트 데이터로 저장
-        return save_user_data(user_id, guest_data)
+        return await save_user_data(db, user_id, guest_data)
     elif merge_strategy == 'append':
         # 기존 사용자 데이터와 합침 (리스트 데이터 예시)
-        user_data = get_user_data(user_id) or []
+        user_data = await get_user_data(db, user_id) or []
         if isinstance(user_data, list) and isinstance(guest_data, list):
             merged = user_data + guest_data
-            return save_user_data(user_id, merged)
+            return await save_user_data(db, user_id, merged)
         else:
             # 타입 불일치 시 replace
-            return save_user_data(user_id, guest_data)
+            return await save_user_data(db, user_id, guest_data)
     else:
         # 기본은 replace
-        return save_user_data(user_id, guest_data)
+        return await save_user_data(db, user_id, guest_data)
@@ -1,14 +1,24 @@
 import os
 import requests
 from dotenv import load_dotenv
+from services.singleflight import SingleFlight
+from services.metrics import instrument
 
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
+GOOGLE_SEARCH_URL = os.getenv("GOOGLE_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
 
+# 같은 검색어가 동시에 몰리면 Google 호출 한 번으로 합침
+search_flight = SingleFlight("google_search")
+
+@instrument("google.google_search")
 def google_search(query, num=3):
-    url = "https://www.googleapis.com/customsearch/v1"
+    return search_flight.do((query, num), _google_search, query, num)
+
+def _google_search(query, num):
+    url = GOOGLE_SEARCH_URL
     params = {
         "key": GOOGLE_API_KEY,
         "cx": GOOGLE_CSE_ID,
@@ -1,6 +1,17 @@
 import os
-from openai import OpenAI
+import asyncio
+import hashlib
+import random
+import httpx
+from contextlib import asynccontextmanager
+from openai import AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
+from services.gpt_cache import gpt_cache, make_cache_key, GPT_CACHE_ENABLED
+from services.singleflight import SingleFlight
+from services.metrics import instrument, track
+from services.rate_limiter import (
+    OpenAIRateLimiter, RateLimitExceeded, estimate_tokens, PRIORITY_ANONYMOUS
+)
 
 load_dotenv()
 
@@ -9,18 +20,37 @@ api_key = os.getenv("OPENAI_API_KEY", "sk-proj-0LjVLBgAEZeH7Ij72Q_Q0Q2x27YaHzI-2
 if not api_key:
     raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
 
-client = OpenAI(api_key=api_key)
+# OpenAI 호환 서버 주소 (예: 부하 테스트용 loadtest/stub_server.py의 http://127.0.0.1:9100/v1), 미설정 시 기본 API
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 
-def call_gpt(user_input: str) -> str:
-    """
-    OpenAI API를 사용하여 GPT 응답을 가져오는 함수
-    """
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # curl에서 사용한 모델로 변경
-            store=True,  # curl에서 사용한 store 파라미터 추가
-            messages=[
-                {"role": "system", "content": """너는 SVO(주어-동사-목적어) 구조가 명확한 답변을 주는 AI야. 
+MODEL = "gpt-4o-mini"  # curl에서 사용한 모델로 변경
+TEMPERATURE = 0.5
+MAX_TOKENS = 180  # 토큰 사용량 최소화 (200 → 180)
+
+# 비동기 클라이언트 설정 (동시 요청 상한, 커넥션 풀 크기, 타임아웃)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+# 클라이언트 측 속도 제한 (계정 한도에 맞춰 설정)
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+OPENAI_MAX_QUEUE_WAIT = float(os.getenv("OPENAI_MAX_QUEUE_WAIT", "20"))  # 초
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))  # 429 재시도 횟수
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "1.0"))  # 초
+
+RATE_LIMIT_MESSAGE = "OpenAI API 사용 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
+
+# 프로세스 전체에서 공유하는 비동기 클라이언트 (첫 사용 시 생성)
+_async_client = None
+
+# 같은 질문이 동시에 몰리면 OpenAI 호출 한 번으로 합침
+gpt_flight = SingleFlight("gpt")
+
+# 동시 요청 상한(OPENAI_MAX_CONCURRENCY)도 제한기가 관리 → 슬롯 대기에도 우선순위와 OPENAI_MAX_QUEUE_WAIT 적용
+rate_limiter = OpenAIRateLimiter(OPENAI_RPM, OPENAI_TPM, OPENAI_MAX_QUEUE_WAIT, OPENAI_MAX_CONCURRENCY)
+
+SYSTEM_PROMPT = """너는 SVO(주어-동사-목적어) 구조가 명확한 답변을 주는 AI야. 
 
 답변 작성 규칙:
 1. 주어(S), 동사(V), 목적어(O)가 명확한 문장으로 답변해
@@ -36,23 +66,140 @@ def call_gpt(user_input: str) -> str:
 ❌ "세종대왕이 한글을 창제한 날짜는 1443년으로 알려져 있으며, 1446년에 '훈민정음'이라는 이름으로 공식 발표되었습니다."
 ✅ "세종대왕이 한글을 창제했다. 세종대왕이 1443년에 한글을 창제했다. 세종대왕이 1446년에 훈민정음을 발표했다."
 
-질문에 대해 자연스럽고 간결하게 설명해줘."""},
-                {"role": "user", "content": user_input}
-            ],
-            temperature=0.5,
-            max_tokens=180,  # 토큰 사용량 최소화 (200 → 180)
+질문에 대해 자연스럽고 간결하게 설명해줘."""
+
+# 시스템 프롬프트가 바뀌면 캐시 키도 자동으로 바뀌도록 프롬프트 해시를 버전으로 사용
+SYSTEM_PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+
+def _build_messages(user_input: str):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_input}
+    ]
+
+def _cache_key(user_input: str) -> str:
+    return make_cache_key(user_input, MODEL, TEMPERATURE, MAX_TOKENS, SYSTEM_PROMPT_VERSION)
+
+def get_async_client() -> AsyncOpenAI:
+    """커넥션 풀을 공유하는 AsyncOpenAI 클라이언트를 반환합니다."""
+    global _async_client
+    if _async_client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+            ),
+            timeout=OPENAI_TIMEOUT,
         )
-        return response.choices[0].message.content
-        
+        # 429 재시도는 rate_limiter가 직접 처리하므로 SDK 자체 재시도는 끔
+        _async_client = AsyncOpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, http_client=http_client, max_retries=0)
+    return _async_client
+
+async def close_async_client():
+    """앱 종료 시 공유 비동기 클라이언트의 커넥션을 정리합니다."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+def _retry_delay(error: RateLimitError, attempt: int) -> float:
+    """429 응답의 retry-after 헤더를 따르고, 없으면 지수 백오프 + 지터"""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        return OPENAI_BACKOFF_BASE * (2 ** attempt) + random.uniform(0, OPENAI_BACKOFF_BASE)
+
+@asynccontextmanager
+async def _completion(user_input: str, priority: int, **kwargs):
+    """
+    속도 제한기에서 차례(동시 호출 슬롯 포함)를 받은 뒤 chat completion을 요청하고, 블록이 끝날 때까지 슬롯을 점유합니다.
+    429를 받으면 슬롯을 반납하고 제한기 전체를 backoff시킨 뒤 OPENAI_MAX_RETRIES번까지 다시 대기열에 섭니다.
+    """
+    cost = SYSTEM_PROMPT_TOKENS + estimate_tokens(user_input) + MAX_TOKENS
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        async with rate_limiter.slot(cost, priority):
+            try:
+                with track("openai.chat_completions"):
+                    response = await get_async_client().chat.completions.create(
+                        model=MODEL,
+                        store=True,
+                        messages=_build_messages(user_input),
+                        temperature=TEMPERATURE,
+                        max_tokens=MAX_TOKENS,
+                        **kwargs
+                    )
+            except RateLimitError as e:
+                if attempt == OPENAI_MAX_RETRIES:
+                    raise
+                delay = _retry_delay(e, attempt)
+                print(f"OpenAI 429 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{OPENAI_MAX_RETRIES})")
+                rate_limiter.backoff(delay)
+                continue
+            yield response
+            return
+
+@instrument("gpt.call_gpt_async")
+async def call_gpt_async(user_input: str, priority: int = PRIORITY_ANONYMOUS) -> str:
+    """
+    OpenAI API로 GPT 응답을 가져옵니다. (같은 질문은 캐시에서 반환)
+    모든 호출은 rate_limiter(RPM/TPM, 동시 요청 수 OPENAI_MAX_CONCURRENCY, 429 backoff)를 거침
+    priority: 속도 제한 대기열 우선순위 (services.rate_limiter.PRIORITY_*)
+    """
+    key = _cache_key(user_input)
+    if GPT_CACHE_ENABLED:
+        cached = await gpt_cache.aget(key)
+        if cached is not None:
+            return cached
+    # 우선순위별로 합침 (익명 요청이 먼저 대기열에 있어도 로그인 사용자는 자기 우선순위로 호출)
+    return await gpt_flight.do_async((key, priority), _complete_async, user_input, key, priority)
+
+async def _complete_async(user_input: str, key: str, priority: int) -> str:
+    try:
+        async with _completion(user_input, priority) as response:
+            content = response.choices[0].message.content
+
+    except (RateLimitError, RateLimitExceeded) as e:
+        print(f"상세 오류: {e}")
+        return RATE_LIMIT_MESSAGE
     except Exception as e:
         print(f"상세 오류: {e}")
         return f"오류가 발생했습니다: {str(e)}"
 
+    if GPT_CACHE_ENABLED and content:
+        await gpt_cache.aset(key, user_input, content)
+    return content
+
+@instrument("gpt.astream_gpt")
+async def astream_gpt(user_input: str, priority: int = PRIORITY_ANONYMOUS):
+    """
+    스트리밍 모드로 GPT 응답을 받아 토큰(텍스트 조각) 단위로 yield하는 비동기 제너레이터 (오류는 호출한 쪽에서 처리)
+    스트림이 끝날 때까지 동시 요청 슬롯 하나를 점유
+    캐시에 있는 질문은 저장된 응답 전체를 한 번에 yield하고, 새 응답은 스트림이 끝나면 캐시에 저장
+    """
+    key = _cache_key(user_input)
+    if GPT_CACHE_ENABLED:
+        cached = await gpt_cache.aget(key)
+        if cached is not None:
+            yield cached
+            return
+    parts = []
+    async with _completion(user_input, priority, stream=True) as stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    if GPT_CACHE_ENABLED and parts:
+        await gpt_cache.aset(key, user_input, "".join(parts))
+
 # 테스트용 함수
 def test_gpt():
     """GPT 연결 테스트"""
     try:
-        result = call_gpt("안녕하세요! 간단한 인사말을 해주세요.")
+        result = asyncio.run(call_gpt_async("안녕하세요! 간단한 인사말을 해주세요."))
         print("✅ GPT 연결 성공!")
         print(f"응답: {result}")
         return True
@@ -66,6 +213,6 @@ if __name__ == "__main__":
     print("세종대왕 한글 창제 날짜 테스트")
     print("="*50)
     test_question = "세종대왕이 한글을 만든 날짜는?"
-    result = call_gpt(test_question)
+    result = asyncio.run(call_gpt_async(test_question))
     print(f"질문: {test_question}")
     print(f"답변: {result}")
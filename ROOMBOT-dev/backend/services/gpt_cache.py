@@ -0,0 +1,107 @@
+import os
+import re
+import json
+import asyncio
+import hashlib
+import unicodedata
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from services.cache import TTLCache
+
+load_dotenv()
+
+# 캐시 설정
+GPT_CACHE_ENABLED = os.getenv("GPT_CACHE_ENABLED", "1") == "1"
+GPT_CACHE_MAXSIZE = int(os.getenv("GPT_CACHE_MAXSIZE", "2048"))
+GPT_CACHE_TTL = float(os.getenv("GPT_CACHE_TTL", "86400"))  # 초 (기본 1일)
+GPT_CACHE_PERSIST = os.getenv("GPT_CACHE_PERSIST", "0") == "1"  # Postgres 영구 캐시 사용 여부
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """유니코드 정규화(NFC) 후 공백을 하나로 합쳐, 표기만 다른 같은 질문을 같은 키로 만듭니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def make_cache_key(prompt: str, model: str, temperature: float, max_tokens: int, system_prompt_version: str) -> str:
+    """정규화된 프롬프트 + 모델 설정 + 시스템 프롬프트 버전으로 캐시 키(sha256)를 만듭니다."""
+    raw = json.dumps(
+        [normalize_prompt(prompt), model, temperature, max_tokens, system_prompt_version],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class GPTResponseCache:
+    """
+    GPT 응답 캐시 (call_gpt_async, astream_gpt)
+    - 1단계: 프로세스 내 LRU + TTL
+    - 2단계(선택): services/db.py의 Postgres 테이블 (gpt_response_cache)
+    """
+
+    def __init__(self, maxsize: int, ttl: float, persist: bool = False):
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.persist = persist
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+        self.persistent_errors = 0
+
+    def get(self, key: str):
+        response = self.memory.get(key)
+        if response is not None or not self.persist:
+            return response
+        try:
+            from services.db import get_gpt_cache_entry
+            response = get_gpt_cache_entry(key)
+        except Exception as e:
+            print(f"GPT 캐시 조회 오류: {e}")
+            self.persistent_errors += 1
+            return None
+        if response is None:
+            self.persistent_misses += 1
+            return None
+        self.persistent_hits += 1
+        self.memory.set(key, response)
+        return response
+
+    def set(self, key: str, prompt: str, response: str):
+        self.memory.set(key, response)
+        if not self.persist:
+            return
+        try:
+            from services.db import save_gpt_cache_entry
+            save_gpt_cache_entry(key, prompt, response, datetime.utcnow() + timedelta(seconds=self.ttl))
+        except Exception as e:
+            print(f"GPT 캐시 저장 오류: {e}")
+            self.persistent_errors += 1
+
+    async def aget(self, key: str):
+        """get의 비동기 버전 (영구 캐시 조회는 스레드에서 실행)"""
+        if not self.persist:
+            return self.memory.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, prompt: str, response: str):
+        if not self.persist:
+            self.memory.set(key, response)
+            return
+        await asyncio.to_thread(self.set, key, prompt, response)
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "persistent": {
+                "enabled": self.persist,
+                "hits": self.persistent_hits,
+                "misses": self.persistent_misses,
+                "errors": self.persistent_errors
+            }
+        }
+
+
+gpt_cache = GPTResponseCache(GPT_CACHE_MAXSIZE, GPT_CACHE_TTL, persist=GPT_CACHE_PERSIST)
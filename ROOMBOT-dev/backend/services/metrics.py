@@ -0,0 +1,236 @@
+import os
+import sys
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from starlette.routing import Match
+
+# ai-engine 경로 추가 (단계 측정 hook 등록용)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-engine'))
+from preprocessing import instrumentation
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Prometheus text format 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 응답 시간 버킷(초): 캐시 hit(ms 이하)부터 OpenAI 응답(수십 초)까지
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 현재 요청의 라우트 경로 (예: /svo, 요청 밖에서 호출되면 "-")
+current_endpoint = ContextVar("metrics_endpoint", default="-")
+
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """레이블 값 튜플별로 값을 저장하는 메트릭 (스레드 안전)"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _samples(self):
+        with self._lock:
+            return [(labels, value) for labels, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self._samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+INF_LABEL = 'le="+Inf"'
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [버킷별 개수(누적 아님), 합계, 개수]
+                state = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            return [(labels, (list(counts), total, count)) for labels, (counts, total, count) in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, (counts, total, count) in self._samples():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """등록된 모든 메트릭을 Prometheus text format으로 반환합니다."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUESTS = Counter("roombot_http_requests_total", "HTTP 요청 수", ("endpoint", "method", "status"))
+HTTP_DURATION = Histogram("roombot_http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 응답 종료까지)",
+                          ("endpoint", "method"))
+HTTP_IN_FLIGHT = Gauge("roombot_http_requests_in_flight", "처리 중인 HTTP 요청 수", ("endpoint",))
+
+STAGE_DURATION = Histogram("roombot_stage_duration_seconds", "단계별 처리 시간 (OpenAI, ETRI, spaCy, Google, Firebase, DB)",
+                           ("stage", "endpoint"))
+STAGE_IN_FLIGHT = Gauge("roombot_stage_in_flight", "실행 중인 단계 수", ("stage", "endpoint"))
+STAGE_ERRORS = Counter("roombot_stage_errors_total", "단계별 예외 수", ("stage", "endpoint", "error"))
+
+
+# 현재 요청의 단계별 처리 시간 [(stage, 초)] (Server-Timing 헤더용)과 프로파일 (services/profiling.py의 미들웨어가 설정)
+request_timings = ContextVar("request_timings", default=None)
+request_profile = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def track(stage: str):
+    """한 단계의 처리 시간/실행 중 개수/예외를 현재 요청의 endpoint 레이블로 기록"""
+    timings = request_timings.get()
+    profile = request_profile.get()
+    if not METRICS_ENABLED and timings is None and profile is None:
+        yield
+        return
+    endpoint = current_endpoint.get()
+    if METRICS_ENABLED:
+        STAGE_IN_FLIGHT.inc(stage, endpoint)
+    if profile is not None:
+        profile.attach_thread()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        if METRICS_ENABLED:
+            STAGE_ERRORS.inc(stage, endpoint, type(e).__name__)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if METRICS_ENABLED:
+            STAGE_DURATION.observe(elapsed, stage, endpoint)
+            STAGE_IN_FLIGHT.dec(stage, endpoint)
+        if timings is not None:
+            timings.append((stage, elapsed))
+        if profile is not None:
+            profile.detach_thread()
+
+
+# ai-engine 함수(ETRI, spaCy)의 측정도 같은 메트릭으로 기록
+instrumentation.set_stage_hook(track)
+
+# 함수 호출 전체를 측정하는 데코레이터 (동기/async/async 제너레이터)
+instrument = instrumentation.instrumented
+
+
+def _route_path(scope) -> str:
+    """요청에 맞는 라우트의 경로 템플릿 (레이블 수가 늘지 않도록 실제 URL 대신 사용)"""
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """요청마다 endpoint 레이블을 정하고 HTTP 요청 수/처리 시간/실행 중 개수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        endpoint = _route_path(scope)
+        method = scope["method"]
+        token = current_endpoint.set(endpoint)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(endpoint)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_DURATION.observe(time.perf_counter() - start, endpoint, method)
+            HTTP_REQUESTS.inc(endpoint, method, str(status))
+            HTTP_IN_FLIGHT.dec(endpoint)
+            current_endpoint.reset(token)
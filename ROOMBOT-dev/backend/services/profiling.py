@@ -0,0 +1,303 @@
+import os
+import re
+import sys
+import time
+import uuid
+import random
+import asyncio
+import threading
+from collections import deque
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from services.metrics import request_timings, request_profile, current_endpoint
+
+load_dotenv()
+
+# 응답마다 단계별 처리 시간을 Server-Timing 헤더로 반환
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "1") == "1"
+
+# 요청 프로파일링 (기본 끔): X-Profile 헤더 값이 PROFILE_TOKEN과 같거나 PROFILE_SAMPLE_RATE 비율로 뽑힌 요청만 샘플링
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")  # X-Profile 헤더 값과 /debug/profiles 요청의 X-Profile-Token이 같아야 함
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+
+if PROFILE_ENABLED and not PROFILE_TOKEN:
+    # 토큰 없이 켜면 아무 클라이언트나 프로파일링을 걸고 스택/경로를 조회할 수 있으므로 켜지 않음
+    print("PROFILE_TOKEN이 설정되지 않아 요청 프로파일링을 끕니다. (PROFILE_ENABLED=1)")
+    PROFILE_ENABLED = False
+
+# 최근 프로파일 (오래된 것부터 밀려남)
+profiles = deque(maxlen=PROFILE_BUFFER_SIZE)
+
+_METRIC_NAME = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+def format_server_timing(timings, total: float) -> str:
+    """[(stage, 초)]를 Server-Timing 헤더 값으로 (같은 단계는 합치고 횟수를 desc로 표시)"""
+    merged = {}
+    for stage, seconds in timings:
+        duration, count = merged.get(stage, (0.0, 0))
+        merged[stage] = (duration + seconds, count + 1)
+    parts = []
+    for stage, (duration, count) in merged.items():
+        part = f"{_METRIC_NAME.sub('_', stage)};dur={duration * 1000:.1f}"
+        if count > 1:
+            part += f';desc="x{count}"'
+        parts.append(part)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _thread_stack(frame):
+    """스레드의 현재 frame부터 바깥쪽까지 → 바깥쪽이 먼저 오는 라벨 리스트"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _task_stack(task):
+    """
+    요청 task의 코루틴 await 체인 (바깥쪽 → 안쪽)
+    이벤트 루프 스레드는 여러 요청이 나눠 쓰므로, 스레드 스택 대신 이 요청의 체인만 따라감
+    """
+    labels = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+class Profile:
+    """한 요청의 샘플링 프로파일 (folded stack: "바깥;...;안쪽" → 샘플 수)"""
+
+    def __init__(self, method: str, path: str, reason: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.endpoint = current_endpoint.get()
+        self.started_at = time.time()
+        self.task = asyncio.current_task()
+        self.child_tasks = []  # 이 요청에서 만든 task (SingleFlight leader, 스트리밍 응답 등)
+        self.loop_thread = threading.get_ident()
+        self.stacks = {}
+        self.samples = 0
+        self.status = None
+        self.duration_ms = None
+        self.timings = None
+        self._threads = {}  # 이 요청의 동기 단계를 실행 중인 스레드 -> 중첩 수
+        self._lock = threading.Lock()
+
+    def attach_thread(self):
+        # 이벤트 루프 스레드는 task 체인으로 샘플링
+        ident = threading.get_ident()
+        if ident == self.loop_thread:
+            return
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def detach_thread(self):
+        ident = threading.get_ident()
+        if ident == self.loop_thread:
+            return
+        with self._lock:
+            count = self._threads.get(ident, 0) - 1
+            if count > 0:
+                self._threads[ident] = count
+            else:
+                self._threads.pop(ident, None)
+
+    def add_task(self, task):
+        with self._lock:
+            self.child_tasks.append(task)
+
+    def sample(self, frames):
+        stacks = []
+        if self.task is not None and not self.task.done():
+            stacks.append(["request"] + _task_stack(self.task))
+        with self._lock:
+            threads = list(self._threads)
+            child_tasks = [task for task in self.child_tasks if not task.done()]
+        for task in child_tasks:
+            stacks.append(["task"] + _task_stack(task))
+        for ident in threads:
+            frame = frames.get(ident)
+            if frame is not None:
+                stacks.append([f"thread-{ident}"] + _thread_stack(frame))
+        with self._lock:
+            self.samples += 1
+            for labels in stacks:
+                key = ";".join(labels)
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def finish(self, duration_ms: float, timings):
+        """요청이 끝나면 기록을 확정하고, 끝난 task 참조를 놓음"""
+        with self._lock:
+            self.duration_ms = duration_ms
+            self.timings = timings
+            self.child_tasks = []
+
+    def folded(self) -> str:
+        """flamegraph.pl / speedscope 등에서 읽는 folded stack 텍스트"""
+        with self._lock:
+            items = sorted(self.stacks.items())
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "endpoint": self.endpoint,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "interval_ms": PROFILE_INTERVAL_MS
+        }
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stacks = dict(self.stacks)
+        return {
+            **self.summary(),
+            "timings": [{"stage": stage, "ms": round(seconds * 1000, 2)} for stage, seconds in self.timings or ()],
+            "stacks": stacks
+        }
+
+
+class _Sampler:
+    """프로파일 중인 요청이 있을 때만 도는 샘플링 스레드"""
+
+    def __init__(self):
+        self._active = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, profile: Profile):
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: Profile):
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self):
+        interval = PROFILE_INTERVAL_MS / 1000
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            frames.pop(me, None)
+            for profile in active:
+                profile.sample(frames)
+            time.sleep(interval)
+
+
+_sampler = _Sampler()
+
+
+def _task_factory(loop, coro, **kwargs):
+    """프로파일 중인 요청 안에서 만든 task를 그 프로파일에 등록 (task를 만드는 쪽의 context에서 호출됨)"""
+    task = asyncio.Task(coro, loop=loop, **kwargs)
+    profile = request_profile.get()
+    if profile is not None:
+        profile.add_task(task)
+    return task
+
+
+def _install_task_factory():
+    # 다른 task factory가 이미 있으면 건드리지 않음 (그때는 요청 task만 샘플링)
+    loop = asyncio.get_running_loop()
+    if loop.get_task_factory() is None:
+        loop.set_task_factory(_task_factory)
+
+
+def _profile_reason(scope):
+    """프로파일링할 요청이면 이유("header"/"sampled"), 아니면 None"""
+    if not PROFILE_ENABLED:
+        return None
+    value = Headers(scope=scope).get("x-profile")
+    if value is not None and value == PROFILE_TOKEN:
+        return "header"
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def get_profile(profile_id: str):
+    for profile in profiles:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+class RequestTimingMiddleware:
+    """
+    요청별 단계 처리 시간을 Server-Timing 헤더로 반환하고, 뽑힌 요청은 프로파일을 저장하는 ASGI 미들웨어
+    - 헤더는 응답 시작 시점에 붙으므로 스트리밍 응답은 스트림 시작 전까지의 단계만 포함
+    - 프로파일 ID는 X-Profile-Id 응답 헤더로 반환 (GET /debug/profiles/{id})
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        reason = _profile_reason(scope)
+        if not SERVER_TIMING_ENABLED and reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        timings_token = request_timings.set(timings)
+        profile = None
+        if reason is not None:
+            profile = Profile(scope["method"], scope["path"], reason)
+            profile_token = request_profile.set(profile)
+            _install_task_factory()
+            _sampler.add(profile)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if SERVER_TIMING_ENABLED:
+                    headers.append("Server-Timing", format_server_timing(timings, time.perf_counter() - start))
+                if profile is not None:
+                    headers.append("X-Profile-Id", profile.id)
+                    profile.status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(timings_token)
+            if profile is not None:
+                _sampler.remove(profile)
+                request_profile.reset(profile_token)
+                profile.finish(round((time.perf_counter() - start) * 1000, 2), timings)
+                profiles.append(profile)
@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+
+# 대기열 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_AUTHENTICATED = 0
+PRIORITY_ANONYMOUS = 1
+
+
+class RateLimitExceeded(Exception):
+    """대기열에서 허용된 시간 안에 차례가 오지 않은 경우"""
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 대략적인 토큰 수를 추정합니다.
+    한글/한자 등 비ASCII 문자는 글자당 약 1토큰, ASCII는 4글자당 약 1토큰으로 계산.
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return non_ascii + ascii_count // 4 + 1
+
+
+class TokenBucket:
+    """capacity만큼 쌓이고 초당 refill_rate만큼 다시 채워지는 토큰 버킷"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.available = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.available = min(self.capacity, self.available + elapsed * self.refill_rate)
+            self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 쓸 수 있을 때까지 남은 시간(초)"""
+        self._refill(now)
+        # 한 번에 capacity보다 큰 요청은 버킷이 가득 찼을 때 허용
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.available -= min(amount, self.capacity)
+
+    def drain(self, now: float):
+        self._refill(now)
+        self.available = min(self.available, 0)
+
+
+class OpenAIRateLimiter:
+    """
+    OpenAI 호출용 클라이언트 측 속도 제한기
+    - 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 각각 토큰 버킷으로 추적
+    - 동시에 진행 중인 호출 수도 max_concurrency로 제한 (슬롯이 빌 때도 같은 우선순위 대기열에서 배정)
+    - 한도를 넘는 호출은 우선순위 대기열에서 기다림 (인증 사용자 우선, 같은 우선순위는 선착순)
+    - 대기 시간이 max_queue_wait를 넘으면 RateLimitExceeded
+    - 429 응답을 받으면 backoff(초) 동안 모든 호출을 멈춤
+    """
+
+    def __init__(self, rpm: int, tpm: int, max_queue_wait: float, max_concurrency: int = 16):
+        self.requests = TokenBucket(rpm, rpm / 60.0)
+        self.tokens = TokenBucket(tpm, tpm / 60.0)
+        self.max_queue_wait = max_queue_wait
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._waiters = []  # (priority, seq, future, cost)
+        self._seq = itertools.count()
+        self._timer = None
+        self._paused_until = 0.0
+        self.granted = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.backoffs = 0
+
+    async def acquire(self, cost: int, priority: int = PRIORITY_ANONYMOUS):
+        """
+        cost 토큰(프롬프트 추정치 + max_tokens), 요청 1건, 동시 호출 슬롯 1개를 확보할 때까지 기다립니다.
+        호출이 끝나면 반드시 release() (slot()을 쓰면 자동)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future, cost))
+        self._dispatch()
+        if future.done():
+            return
+        self.queued += 1
+        try:
+            await asyncio.wait_for(future, timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise RateLimitExceeded(f"OpenAI 호출 대기 시간 초과 ({self.max_queue_wait:g}초)")
+        except asyncio.CancelledError:
+            # 슬롯을 배정받은 직후 취소되면 슬롯을 돌려놓음
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """호출이 끝나 동시 호출 슬롯을 반환합니다."""
+        self.in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, cost: int, priority: int = PRIORITY_ANONYMOUS):
+        """acquire ~ release 구간 (블록을 벗어나면 슬롯 반환)"""
+        await self.acquire(cost, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def backoff(self, seconds: float):
+        """429 응답 시 seconds 동안 새 호출을 보내지 않도록 멈춥니다."""
+        now = time.monotonic()
+        self.backoffs += 1
+        self._paused_until = max(self._paused_until, now + seconds)
+        self.requests.drain(now)
+        self._schedule(seconds)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            priority, seq, future, cost = self._waiters[0]
+            if future.done():  # 시간 초과/취소된 대기자
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= self.max_concurrency:
+                # 슬롯이 비면 release()에서 다시 배정
+                return
+            wait = max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(cost, now)
+            )
+            if wait > 0:
+                self._schedule(wait)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.consume(1, now)
+            self.tokens.consume(cost, now)
+            self.in_flight += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        self.requests._refill(now)
+        self.tokens._refill(now)
+        return {
+            "queue_length": sum(1 for w in self._waiters if not w[2].done()),
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "requests_available": int(self.requests.available),
+            "tokens_available": int(self.tokens.available),
+            "paused_for": round(max(0.0, self._paused_until - now), 3),
+            "granted": self.granted,
+            "queued": self.queued,
+            "timeouts": self.timeouts,
+            "backoffs": self.backoffs
+        }
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+# 이름 -> SingleFlight (통계 조회용)
+flights = {}
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 upstream 호출로 합칩니다. (single-flight)
+    - 먼저 들어온 호출(leader)만 실제로 실행하고, 나머지는 그 결과(또는 예외)를 함께 받음
+    - 호출이 끝나면 키를 지우므로 결과를 저장하지는 않음 (캐시와 별개)
+    - do: 스레드(동기 라우트)용, do_async: 이벤트 루프(async 라우트)용
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.executed = 0
+        self.coalesced = 0
+        flights[name] = self
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key, fn, *args, **kwargs):
+        task = self._tasks.get(key)
+        if task is None:
+            # 별도 태스크로 실행해, 먼저 온 요청이 취소돼도 나머지 대기자는 결과를 받도록 함
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls) + len(self._tasks),
+            "executed": self.executed,
+            "coalesced": self.coalesced
+        }
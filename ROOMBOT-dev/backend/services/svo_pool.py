@@ -0,0 +1,144 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+from services.metrics import track
+from preprocessing.svo_extractor_en import (
+    extract_svo_en, extract_svo_en_batch, parse_svo_en_docs, format_svo_en, parse_cache, load_parse_cache,
+    _extract_svo_from_tokens
+)
+
+load_dotenv()
+
+# 영어 SVO 파싱 전용 프로세스 풀 설정 (SVO_WORKERS=0이면 풀 없이 스레드에서 실행)
+SVO_WORKERS = int(os.getenv("SVO_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+SVO_MAX_PENDING = int(os.getenv("SVO_MAX_PENDING", "64"))  # 풀에 넣을 수 있는 최대 대기 작업 수
+
+_executor = None
+_pending = 0
+_completed = 0
+_rejected = 0
+
+
+class SVOPoolBusy(Exception):
+    """대기 작업이 SVO_MAX_PENDING을 넘은 경우"""
+    pass
+
+
+def _init_worker():
+    # 워커마다 모델을 미리 로드해 요청마다 로드 비용을 내지 않도록 함
+    # 디스크 캐시(DocBin)는 부모 프로세스가 관리 (워커는 파싱한 Doc을 직렬화해서 돌려줌)
+    parse_cache.docbin_path = None
+    from preprocessing.svo_extractor_en import get_nlp
+    get_nlp()
+
+
+def _ready():
+    return os.getpid()
+
+
+def start_pool():
+    """앱 시작 시 워커 프로세스를 띄우고 모델을 미리 로드합니다."""
+    global _executor
+    if SVO_WORKERS <= 0 or _executor is not None:
+        return
+    # 부모 프로세스는 모델을 로드하지 않으므로 디스크 tier를 빈 Vocab으로 읽어옴
+    load_parse_cache()
+    # fork 대신 spawn: 이벤트 루프/스레드 상태를 물려받지 않도록 함
+    _executor = ProcessPoolExecutor(
+        max_workers=SVO_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    )
+    # 워커는 작업이 들어와야 생기므로, 워커 수만큼 빈 작업을 넣어 미리 띄움
+    for _ in range(SVO_WORKERS):
+        _executor.submit(_ready)
+    print(f"SVO 워커 프로세스 {SVO_WORKERS}개 시작")
+
+
+def shutdown_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run(fn, *args):
+    global _pending, _completed, _rejected
+    if _executor is None:
+        return await asyncio.to_thread(fn, *args)
+    if _pending >= SVO_MAX_PENDING:
+        _rejected += 1
+        raise SVOPoolBusy("SVO 분석 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+    _pending += 1
+    try:
+        # 워커 프로세스에서는 측정 hook이 없으므로 대기 시간을 포함해 여기서 측정
+        with track(f"svo_pool.{fn.__name__}"):
+            return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+        _completed += 1
+
+
+async def _parse(texts):
+    """캐시에 없는 문장들을 파싱해 SVO 결과 리스트를 반환하고 이 프로세스의 캐시(디스크 tier 포함)에 저장"""
+    if _executor is None:
+        # 스레드에서 실행하면 추출 함수가 Doc과 함께 직접 캐시에 저장
+        if len(texts) == 1:
+            return [await _run(extract_svo_en, texts[0])]
+        return [r["svo"] for r in await _run(extract_svo_en_batch, texts)]
+    results, data = await _run(parse_svo_en_docs, texts, parse_cache.docbin_path is not None)
+    if data is None:
+        parse_cache.set_serialized(texts, results)
+    else:
+        # DocBin 복원과 주기적인 디스크 저장(flush)이 이벤트 루프를 막지 않도록 스레드에서
+        await asyncio.to_thread(parse_cache.set_serialized, texts, results, data)
+    return results
+
+
+async def analyze_svo_en_async(text: str):
+    """analyze_svo_en의 비동기 버전 (파싱은 워커 프로세스에서, 캐시는 이 프로세스에서 확인)"""
+    svo_result = parse_cache.get(text, _extract_svo_from_tokens)
+    if svo_result is None:
+        try:
+            svo_result = (await _parse([text]))[0]
+        except SVOPoolBusy:
+            raise
+        except Exception as e:
+            print(f"영어 SVO 분석 오류: {e}")
+            return format_svo_en(text, {"S": [], "V": [], "O": []})
+    return format_svo_en(text, svo_result)
+
+
+async def analyze_svo_en_batch_async(sentences):
+    """analyze_svo_batch(lang="en")의 비동기 버전 (캐시에 없는 문장만 한 번에 워커로 보냄)"""
+    items = [
+        (s["sentence_id"], s["text"]) if isinstance(s, dict) else (i + 1, s)
+        for i, s in enumerate(sentences)
+    ]
+    results = {}
+    misses = []
+    for _, text in items:
+        if text in results:
+            continue
+        results[text] = parse_cache.get(text, _extract_svo_from_tokens)
+        if results[text] is None:
+            misses.append(text)
+    if misses:
+        for text, svo_result in zip(misses, await _parse(misses)):
+            results[text] = svo_result
+    return [
+        {"sentence_id": sentence_id, **format_svo_en(text, results[text])}
+        for sentence_id, text in items
+    ]
+
+
+def stats() -> dict:
+    return {
+        "workers": SVO_WORKERS if _executor is not None else 0,
+        "pending": _pending,
+        "max_pending": SVO_MAX_PENDING,
+        "completed": _completed,
+        "rejected": _rejected
+    }
@@ -0,0 +1,44 @@
+"""
+/save-user 테스트 (Firebase/Postgres 없이 실행)
+python -m pytest test_save_user.py
+"""
+
+import time
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.users as users
+import auth.dependencies as dependencies
+from services import auth_cache
+
+
+def test_save_user_stores_latest_firebase_profile(monkeypatch):
+    """토큰이 그대로여도 Firebase 프로필이 바뀌면 바뀐 email/display_name을 저장"""
+    record = {"email": "old@example.com", "display_name": "이전 이름"}
+    saved = []
+
+    def verify_firebase_token(id_token):
+        return {"uid": "user-1", "exp": time.time() + 3600}
+
+    def get_user_by_uid(uid):
+        return SimpleNamespace(uid=uid, photo_url=None, email_verified=True, **record)
+
+    monkeypatch.setattr(dependencies, "verify_firebase_token", verify_firebase_token)
+    monkeypatch.setattr(dependencies, "get_user_by_uid", get_user_by_uid)
+    monkeypatch.setattr(users, "upsert_user", lambda *args: saved.append(args))
+    auth_cache.token_cache.clear()
+
+    app = FastAPI()
+    app.include_router(users.router)
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer same-token"}
+
+    assert client.post("/save-user", headers=headers).status_code == 200
+    record.update(email="new@example.com", display_name="새 이름")
+    assert client.post("/save-user", headers=headers).status_code == 200
+
+    assert saved == [
+        ("user-1", "old@example.com", "이전 이름"),
+        ("user-1", "new@example.com", "새 이름"),
+    ]
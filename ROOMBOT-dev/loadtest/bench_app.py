@@ -0,0 +1,360 @@
+"""
+백엔드(main.app) 부하 테스트 / 지연 시간 벤치마크
+
+대역 서버(stub_server.py)와 백엔드(uvicorn)를 하위 프로세스로 띄운 뒤, 여러 라우트를 섞은 요청을
+동시성 단계별로 보내고 라우트별 처리량과 p50/p95/p99 응답 시간을 JSON으로 저장합니다.
+
+실행:
+    python loadtest/bench_app.py --concurrency 1,8,32 --requests 300 --out loadtest/results/now.json
+    python loadtest/bench_app.py --compare loadtest/results/before.json --out loadtest/results/after.json
+    python loadtest/bench_app.py --target http://127.0.0.1:8000   # 이미 실행 중인 서버 (대역 서버도 직접 연결)
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+import tempfile
+from collections import defaultdict
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BACKEND_DIR = os.path.join(ROOT, 'backend')
+
+# main.py가 protected 라우터를 prefix="/protected"로 한 번 더 등록하므로 실제 경로는 /protected/protected/...
+PROTECTED_PREFIX = "/protected/protected"
+
+# 작업 종류별 비중
+DEFAULT_MIX = {
+    "analyze": 3,
+    "analyze_stream": 1,
+    "svo_ko": 3,
+    "svo_en": 2,
+    "google_search": 1,
+    "user_data_write": 1,
+    "user_data_read": 2,
+    "guest_merge": 1
+}
+
+PROMPTS = [
+    "세종대왕은 어떤 업적을 남겼어?",
+    "훈민정음은 언제 반포되었어?",
+    "이순신 장군에 대해 알려줘",
+    "조선은 언제 건국되었어?",
+    "장영실은 무엇을 발명했어?",
+]
+KO_SENTENCES = [
+    "세종대왕이 훈민정음을 창제했다.",
+    "학생들이 역사 교과서를 읽는다.",
+    "윤동주는 한국의 독립운동가이자 시인이었다.",
+    "오늘 날씨가 정말 좋네요",
+    "고려의 수도는 개경이었습니다.",
+]
+EN_SENTENCES = [
+    "King Sejong created the Korean alphabet.",
+    "The students read a history book.",
+    "John and Mary eat an apple and a banana.",
+    "The book was read by Tom.",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"{url} 응답 없음 ({timeout}초)")
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Processes:
+    """대역 서버와 백엔드 하위 프로세스"""
+
+    def __init__(self, args):
+        self.args = args
+        self.procs = []
+        self.stub_url = None
+        self.app_url = args.target
+        self.tmpdir = tempfile.mkdtemp(prefix="roombot-loadtest-")
+
+    def start(self):
+        stub_port = _free_port()
+        self.stub_url = f"http://127.0.0.1:{stub_port}"
+        stub_cmd = [sys.executable, os.path.join(ROOT, "loadtest", "stub_server.py"), "--port", str(stub_port),
+                    "--seed", str(self.args.seed)]
+        if self.args.stub_config:
+            stub_cmd += ["--config", self.args.stub_config]
+        self._spawn(stub_cmd, ROOT, os.environ.copy(), "stub.log")
+        _wait_ready(f"{self.stub_url}/stub/stats")
+        if self.app_url:
+            return
+
+        app_port = _free_port()
+        self.app_url = f"http://127.0.0.1:{app_port}"
+        env = os.environ.copy()
+        env.update({
+            "OPENAI_API_KEY": env.get("OPENAI_API_KEY", "sk-loadtest"),
+            "OPENAI_BASE_URL": f"{self.stub_url}/v1",
+            "ETRI_API_URL": f"{self.stub_url}/api/WiseNLU",
+            "ETRI_SPOKEN_API_URL": f"{self.stub_url}/api/WiseNLU_spoken",
+            "ETRI_API_KEY": "loadtest",
+            "GOOGLE_SEARCH_URL": f"{self.stub_url}/customsearch/v1",
+            "GOOGLE_API_KEY": "loadtest",
+            "GOOGLE_CSE_ID": "loadtest",
+            "FIREBASE_AUTH_EMULATOR_HOST": self.stub_url.replace("http://", ""),
+        })
+        # DB를 따로 지정하지 않으면 임시 sqlite 파일 사용 (실제 수치는 Postgres로 측정 권장)
+        env["POSTGRES_URL"] = self.args.database_url or env.get("POSTGRES_URL") or f"sqlite:///{self.tmpdir}/loadtest.db"
+        app_cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(app_port),
+                   "--workers", str(self.args.app_workers), "--log-level", "warning"]
+        self._spawn(app_cmd, BACKEND_DIR, env, "app.log")
+        _wait_ready(f"{self.app_url}/health", timeout=120)
+
+    def _spawn(self, cmd, cwd, env, log_name):
+        log = open(os.path.join(self.tmpdir, log_name), "w")
+        self.procs.append(subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT))
+
+    def stop(self):
+        for proc in reversed(self.procs):
+            proc.terminate()
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+class Workload:
+    """작업 종류별 요청 (한 작업이 여러 요청이면 요청마다 따로 기록)"""
+
+    def __init__(self, client: httpx.AsyncClient, tokens, rng: random.Random, unique_ratio: float):
+        self.client = client
+        self.tokens = tokens
+        self.rng = rng
+        self.unique_ratio = unique_ratio
+        self.counter = 0
+        self.samples = defaultdict(list)  # 이름 -> [(응답 시간(초), 성공 여부)]
+
+    async def _request(self, name: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            body = response.content
+            # 라우트가 200과 함께 {"error": ...}를 돌려주는 경우도 실패로 집계
+            ok = response.status_code < 400 and not body.startswith(b'{"error"')
+        except httpx.HTTPError:
+            pass
+        self.samples[name].append((time.perf_counter() - start, ok))
+        return ok
+
+    def _auth(self):
+        uid, token = self.rng.choice(self.tokens)
+        return uid, {"Authorization": f"Bearer {token}"}
+
+    def _prompt(self):
+        self.counter += 1
+        prompt = self.rng.choice(PROMPTS)
+        if self.rng.random() < self.unique_ratio:
+            # 캐시에 없는 질문
+            prompt = f"{prompt} ({self.counter})"
+        return prompt
+
+    async def run(self, kind: str):
+        if kind == "analyze":
+            await self._request(kind, "POST", "/analyze", json={"prompt": self._prompt()})
+        elif kind == "analyze_stream":
+            await self._request(kind, "POST", "/analyze/stream", json={"prompt": self._prompt()})
+        elif kind == "svo_ko":
+            await self._request(kind, "POST", "/svo", json={"text": self.rng.choice(KO_SENTENCES), "language": "ko"})
+        elif kind == "svo_en":
+            await self._request(kind, "POST", "/svo", json={"text": self.rng.choice(EN_SENTENCES), "language": "en"})
+        elif kind == "google_search":
+            await self._request(kind, "POST", "/google_search", json={"query": self.rng.choice(PROMPTS)})
+        elif kind == "user_data_write":
+            _, headers = self._auth()
+            await self._request(kind, "POST", f"{PROTECTED_PREFIX}/user-data", headers=headers,
+                                json={"data": {"history": [self._prompt()]}})
+        elif kind == "user_data_read":
+            _, headers = self._auth()
+            await self._request(kind, "GET", f"{PROTECTED_PREFIX}/user-data", headers=headers)
+        elif kind == "guest_merge":
+            self.counter += 1
+            guest_id = f"guest-{self.counter}-{self.rng.random():.6f}"
+            if await self._request("guest_data_write", "POST", "/guest-data",
+                                   json={"guest_id": guest_id, "data": {"history": [self._prompt()]}}):
+                _, headers = self._auth()
+                await self._request(kind, "POST", f"{PROTECTED_PREFIX}/merge-guest-data", headers=headers,
+                                    json={"guest_id": guest_id, "merge_strategy": "append"})
+
+
+def summarize(samples, elapsed: float) -> dict:
+    endpoints = {}
+    for name, values in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in values)
+        errors = sum(1 for _, ok in values if not ok)
+        endpoints[name] = {
+            "count": len(values),
+            "errors": errors,
+            "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2)
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    return {
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints
+    }
+
+
+async def run_level(app_url: str, tokens, concurrency: int, operations: int, mix: dict, seed: int, unique_ratio: float):
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    rng = random.Random(seed + concurrency)
+    plan = rng.choices(kinds, weights=weights, k=operations)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=120) as client:
+        workload = Workload(client, tokens, rng, unique_ratio)
+        queue = iter(plan)
+
+        async def worker():
+            for kind in queue:
+                await workload.run(kind)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, **summarize(workload.samples, elapsed)}
+
+
+async def prepare_users(app_url: str, stub_url: str, users: int):
+    """사용자별 ID 토큰을 받고, 조회 작업이 404가 되지 않도록 사용자 데이터를 한 번씩 저장"""
+    tokens = []
+    async with httpx.AsyncClient(timeout=60) as client:
+        for i in range(users):
+            uid = f"loadtest-user-{i}"
+            token = (await client.get(f"{stub_url}/stub/token", params={"uid": uid})).json()["id_token"]
+            tokens.append((uid, token))
+            await client.post(f"{app_url}{PROTECTED_PREFIX}/user-data", json={"data": {"history": []}},
+                              headers={"Authorization": f"Bearer {token}"})
+    return tokens
+
+
+def print_level(level: dict):
+    print(f"\n동시성 {level['concurrency']}: {level['requests']}건 / {level['duration_s']}초, "
+          f"{level['throughput_rps']} req/s, 오류 {level['errors']}건")
+    print(f"  {'endpoint':<18}{'count':>7}{'err':>6}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, e in level["endpoints"].items():
+        print(f"  {name:<18}{e['count']:>7}{e['errors']:>6}{e['rps']:>9}"
+              f"{e['p50_ms']:>9.1f}m{e['p95_ms']:>9.1f}m{e['p99_ms']:>9.1f}m")
+
+
+def compare(previous: dict, current: dict):
+    """이전 결과와 동시성/라우트별 처리량, p95 비교"""
+    before = {level["concurrency"]: level for level in previous.get("levels", [])}
+    print(f"\n=== 비교: {previous.get('meta', {}).get('git_commit', '?')} → {current['meta'].get('git_commit', '?')} ===")
+    for level in current["levels"]:
+        old = before.get(level["concurrency"])
+        if old is None:
+            continue
+        print(f"동시성 {level['concurrency']}: {old['throughput_rps']} → {level['throughput_rps']} req/s")
+        for name, e in level["endpoints"].items():
+            o = old["endpoints"].get(name)
+            if o and o["p95_ms"]:
+                change = (e["p95_ms"] - o["p95_ms"]) / o["p95_ms"] * 100
+                print(f"  {name:<18} p95 {o['p95_ms']:.1f} → {e['p95_ms']:.1f}ms ({change:+.1f}%)")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROOMBOT 백엔드 부하 테스트")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시성 단계 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=200, help="단계별 작업 수")
+    parser.add_argument("--mix", help='작업 비중 JSON (예: {"svo_ko": 1, "analyze": 1})')
+    parser.add_argument("--users", type=int, default=20, help="인증 사용자 수")
+    parser.add_argument("--unique-ratio", type=float, default=0.5, help="GPT 캐시에 없는 질문 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-config", help="stub_server.py 설정 JSON")
+    parser.add_argument("--database-url", help="백엔드 DB (미지정 시 POSTGRES_URL 또는 임시 sqlite)")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--target", help="이미 실행 중인 백엔드 주소 (지정 시 백엔드는 띄우지 않음)")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    processes = Processes(args)
+    try:
+        processes.start()
+        print(f"백엔드: {processes.app_url}, 대역 서버: {processes.stub_url} (로그: {processes.tmpdir})")
+        tokens = asyncio.run(prepare_users(processes.app_url, processes.stub_url, args.users))
+        results = []
+        for concurrency in levels:
+            level = asyncio.run(run_level(processes.app_url, tokens, concurrency, args.requests, mix,
+                                          args.seed, args.unique_ratio))
+            print_level(level)
+            results.append(level)
+        stub_stats = httpx.get(f"{processes.stub_url}/stub/stats").json()
+    finally:
+        processes.stop()
+
+    report = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+            "mix": mix
+        },
+        "levels": results,
+        "stub": {"counts": stub_stats["counts"], "config": stub_stats["config"]}
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
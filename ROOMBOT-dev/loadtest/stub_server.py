@@ -0,0 +1,437 @@
+"""
+부하 테스트용 외부 서비스 대역 서버 (OpenAI / ETRI WiseNLU / Google Custom Search / Firebase Auth 에뮬레이터)
+
+실제 서비스와 같은 요청/응답 형식으로 응답하며, 서비스별로 응답 지연 분포, 오류 비율,
+녹화된 응답 재생(replay)을 설정할 수 있습니다.
+
+실행:
+    python loadtest/stub_server.py --port 9100 [--config loadtest/stub_config.example.json] [--replay recorded.jsonl]
+
+백엔드를 대역 서버로 연결:
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1
+    ETRI_API_URL=http://127.0.0.1:9100/api/WiseNLU
+    ETRI_SPOKEN_API_URL=http://127.0.0.1:9100/api/WiseNLU_spoken
+    GOOGLE_SEARCH_URL=http://127.0.0.1:9100/customsearch/v1
+    FIREBASE_AUTH_EMULATOR_HOST=127.0.0.1:9100
+
+인증이 필요한 라우트용 ID 토큰: GET /stub/token?uid=user-1 (에뮬레이터용 서명 없는 토큰)
+"""
+import os
+import sys
+import copy
+import json
+import math
+import time
+import random
+import base64
+import asyncio
+import hashlib
+import argparse
+from collections import defaultdict
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+# ai-engine 경로 추가 (ETRI 응답의 문장 분리/SRL 생성에 사용)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-engine'))
+from preprocessing.sentence_splitter import split_sentences
+from preprocessing.svo_extractor_ko_rules import extract_svo_rules
+
+# 서비스별 기본 설정
+# latency: {"dist": "fixed", "ms"} | {"dist": "uniform", "min_ms", "max_ms"} | {"dist": "lognormal", "median_ms", "p95_ms"}
+DEFAULT_CONFIG = {
+    "openai": {
+        "latency": {"dist": "lognormal", "median_ms": 900, "p95_ms": 2500},  # 첫 토큰까지
+        "chunk_ms": 30,  # 스트리밍 청크 간격
+        "error_rate": 0.0,
+        "error_status": 429,
+        "retry_after": 1,
+        "answer_sentences": 4
+    },
+    "etri": {
+        "latency": {"dist": "lognormal", "median_ms": 400, "p95_ms": 1200},
+        "error_rate": 0.0,
+        "error_status": 503,
+        "empty_rate": 0.0
+    },
+    "etri_spoken": {
+        "latency": {"dist": "lognormal", "median_ms": 400, "p95_ms": 1200},
+        "error_rate": 0.0,
+        "error_status": 503,
+        "empty_rate": 1.0  # 현재 구어체 API는 빈 응답을 반환
+    },
+    "google": {
+        "latency": {"dist": "lognormal", "median_ms": 300, "p95_ms": 800},
+        "error_rate": 0.0,
+        "error_status": 429
+    },
+    "firebase": {
+        "latency": {"dist": "fixed", "ms": 5},
+        "error_rate": 0.0,
+        "error_status": 500
+    }
+}
+
+# 대역 서버가 지어내는 GPT 답변 문장 (SVO가 분명한 문장과 복잡한 문장을 섞음)
+ANSWER_SENTENCES = [
+    "세종대왕이 훈민정음을 창제했다.",
+    "훈민정음은 1446년에 반포되었습니다.",
+    "이순신 장군이 거북선을 만들었다.",
+    "조선은 1392년에 건국되었다.",
+    "학생들이 역사 교과서를 읽는다.",
+    "윤동주는 한국의 독립운동가이자 시인이었다.",
+    "고려의 수도는 개경이었습니다.",
+    "장영실이 측우기를 발명했다.",
+]
+
+
+def _key(text: str) -> str:
+    return " ".join(str(text).split())
+
+
+class StubState:
+    """설정, 재생용 녹화 응답, 서비스별 요청/오류 수"""
+
+    def __init__(self, config: dict = None, replay: dict = None, seed: int = None):
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
+        self.update(config or {})
+        self.replay = replay or {}
+        self.random = random.Random(seed)
+        self.counts = defaultdict(lambda: {"requests": 0, "errors": 0, "empty": 0, "replayed": 0})
+
+    def update(self, config: dict):
+        for service, values in config.items():
+            self.config.setdefault(service, {}).update(values)
+
+    def delay(self, service: str) -> float:
+        """설정된 분포에서 응답 지연(초)을 뽑습니다."""
+        latency = self.config[service].get("latency") or {"dist": "fixed", "ms": 0}
+        dist = latency.get("dist", "fixed")
+        if dist == "uniform":
+            ms = self.random.uniform(latency["min_ms"], latency["max_ms"])
+        elif dist == "lognormal":
+            # median과 p95로 lognormal 분포의 sigma 계산 (p95 = median * e^(1.645 sigma))
+            median = latency["median_ms"]
+            sigma = math.log(max(latency.get("p95_ms", median), median) / median) / 1.645 if median > 0 else 0
+            ms = self.random.lognormvariate(math.log(median), sigma) if median > 0 else 0
+        else:
+            ms = latency.get("ms", 0)
+        return ms / 1000
+
+    def should_fail(self, service: str) -> bool:
+        return self.random.random() < self.config[service].get("error_rate", 0)
+
+    def should_be_empty(self, service: str) -> bool:
+        return self.random.random() < self.config[service].get("empty_rate", 0)
+
+    def recorded(self, service: str, key: str):
+        entry = self.replay.get((service, _key(key)))
+        if entry is not None:
+            self.counts[service]["replayed"] += 1
+        return entry
+
+
+def load_replay(path: str) -> dict:
+    """
+    녹화된 응답(JSONL)을 읽습니다. 한 줄에 하나:
+    {"service": "openai|etri|etri_spoken|google|firebase", "key": "...", "response": {...}, "status": 200}
+    key: openai=마지막 user 메시지, etri=분석할 text, google=검색어 q, firebase=uid
+    openai는 "response" 대신 "content"(답변 문자열)만 적어도 됨
+    """
+    replay = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            replay[(entry["service"], _key(entry["key"]))] = entry
+    return replay
+
+
+def _b64(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def make_emulator_token(uid: str, project_id: str, email: str = None, ttl: int = 3600) -> str:
+    """Firebase Auth 에뮬레이터 형식의 ID 토큰 (alg: none, 서명 없음)"""
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{project_id}",
+        "aud": project_id,
+        "sub": uid,
+        "user_id": uid,
+        "auth_time": now,
+        "iat": now,
+        "exp": now + ttl,
+        "email": email or f"{uid}@example.com",
+        "email_verified": True,
+        "firebase": {"identities": {}, "sign_in_provider": "custom"}
+    }
+    return f"{_b64({'alg': 'none', 'typ': 'JWT'})}.{_b64(payload)}."
+
+
+def make_answer(prompt: str, sentence_count: int) -> str:
+    seed = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8], 16)
+    start = seed % len(ANSWER_SENTENCES)
+    return " ".join(ANSWER_SENTENCES[(start + i) % len(ANSWER_SENTENCES)] for i in range(sentence_count))
+
+
+def make_etri_sentence(index: int, text: str) -> dict:
+    """WiseNLU srl 응답의 sentence 항목 (morp/word/dependency/SRL)"""
+    words = text.split()
+    rules = extract_svo_rules(text)
+    morp = []
+    for i, word in enumerate(words):
+        morp.append({"id": len(morp), "lemma": word, "type": "NNG", "position": i, "weight": 0.9})
+    dependency = []
+    for i, word in enumerate(words):
+        word_clean = word.strip(".,!?")
+        if word_clean == rules["S"]:
+            label = "NP_SBJ"
+        elif i == len(words) - 1:
+            label = "VNP"
+        elif word_clean == rules["O"]:
+            label = "NP_OBJ"
+        else:
+            label = "NP_AJT"
+        dependency.append({"id": i, "text": word, "head": len(words) - 1 if i < len(words) - 1 else -1,
+                           "label": label, "mod": [], "weight": 0.8})
+    srl = []
+    if rules["S"] and rules["V"] and rules["O"]:
+        srl.append({
+            "verb": rules["V"],
+            "sense": 1,
+            "word_id": len(words) - 1,
+            "weight": 0.7,
+            "argument": [
+                {"type": "ARG0", "word_id": 0, "text": rules["S"], "weight": 0.6},
+                {"type": "ARG1", "word_id": 1, "text": rules["O"], "weight": 0.6}
+            ]
+        })
+    return {
+        "id": index,
+        "reserve_str": "",
+        "text": text,
+        "morp": morp,
+        "word": [{"id": i, "text": w, "type": "", "begin": i, "end": i} for i, w in enumerate(words)],
+        "NE": [],
+        "dependency": dependency,
+        "SRL": srl
+    }
+
+
+def make_etri_response(text: str) -> dict:
+    sentences = []
+    for line in text.split("\n"):
+        for sentence in split_sentences(line):
+            sentences.append(make_etri_sentence(len(sentences), sentence))
+    return {"result": 0, "return_object": {"doc_id": "", "sentence": sentences}}
+
+
+def create_app(state: StubState) -> FastAPI:
+    app = FastAPI(title="ROOMBOT external service stubs")
+
+    async def begin(service: str):
+        state.counts[service]["requests"] += 1
+        await asyncio.sleep(state.delay(service))
+
+    def error(service: str, body: dict, headers: dict = None):
+        state.counts[service]["errors"] += 1
+        return JSONResponse(body, status_code=state.config[service]["error_status"], headers=headers)
+
+    # ---- OpenAI Chat Completions ----
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        config = state.config["openai"]
+        await begin("openai")
+        if state.should_fail("openai"):
+            status = config["error_status"]
+            headers = {"retry-after": str(config.get("retry_after", 1))} if status == 429 else None
+            return error("openai", {"error": {
+                "message": "Rate limit reached (stub)" if status == 429 else "The server had an error (stub)",
+                "type": "rate_limit_exceeded" if status == 429 else "server_error",
+                "param": None,
+                "code": "rate_limit_exceeded" if status == 429 else None
+            }}, headers)
+
+        prompt = next((m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+        model = body.get("model", "gpt-4o-mini")
+        recorded = state.recorded("openai", prompt)
+        if recorded is not None and "response" in recorded and not body.get("stream"):
+            return JSONResponse(recorded["response"], status_code=recorded.get("status", 200))
+        if recorded is not None and "content" in recorded:
+            content = recorded["content"]
+        else:
+            content = make_answer(prompt, config.get("answer_sentences", 4))
+
+        completion_id = f"chatcmpl-stub-{state.counts['openai']['requests']}"
+        created = int(time.time())
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 2
+        completion_tokens = len(content) // 2
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "logprobs": None,
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            }
+
+        async def events():
+            def chunk(delta: dict, finish_reason=None):
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish_reason}]
+                }
+                return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            # 실제 API처럼 몇 글자씩 나눠 전송
+            for i in range(0, len(content), 4):
+                await asyncio.sleep(config.get("chunk_ms", 0) / 1000)
+                yield chunk({"content": content[i:i + 4]})
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # ---- ETRI WiseNLU ----
+    async def wisenlu(request: Request, service: str):
+        body = json.loads(await request.body())
+        text = body.get("argument", {}).get("text", "")
+        await begin(service)
+        if state.should_fail(service):
+            return error(service, {"result": -1, "reason": "Service Unavailable (stub)"})
+        recorded = state.recorded(service, text)
+        if recorded is not None:
+            return JSONResponse(recorded["response"], status_code=recorded.get("status", 200))
+        if state.should_be_empty(service):
+            state.counts[service]["empty"] += 1
+            return {"result": 0, "return_object": {}}
+        return make_etri_response(text)
+
+    @app.post("/api/WiseNLU")
+    async def etri_written(request: Request):
+        return await wisenlu(request, "etri")
+
+    @app.post("/api/WiseNLU_spoken")
+    async def etri_spoken(request: Request):
+        return await wisenlu(request, "etri_spoken")
+
+    # ---- Google Custom Search JSON API ----
+    @app.get("/customsearch/v1")
+    async def custom_search(q: str = "", num: int = 10, key: str = None, cx: str = None):
+        await begin("google")
+        if state.should_fail("google"):
+            status = state.config["google"]["error_status"]
+            return error("google", {"error": {"code": status, "message": "Quota exceeded (stub)", "status": "RESOURCE_EXHAUSTED"}})
+        recorded = state.recorded("google", q)
+        if recorded is not None:
+            return JSONResponse(recorded["response"], status_code=recorded.get("status", 200))
+        digest = hashlib.sha1(q.encode("utf-8")).hexdigest()[:10]
+        num = max(1, min(num, 10))
+        return {
+            "kind": "customsearch#search",
+            "queries": {"request": [{"searchTerms": q, "count": num, "startIndex": 1}]},
+            "searchInformation": {"searchTime": 0.1, "formattedSearchTime": "0.10", "totalResults": str(num * 100)},
+            "items": [
+                {
+                    "kind": "customsearch#result",
+                    "title": f"{q} - 검색 결과 {i + 1}",
+                    "link": f"https://example.com/{digest}/{i + 1}",
+                    "displayLink": "example.com",
+                    "snippet": f"{q}에 대한 설명입니다. {ANSWER_SENTENCES[i % len(ANSWER_SENTENCES)]}"
+                }
+                for i in range(num)
+            ]
+        }
+
+    # ---- Firebase Auth 에뮬레이터 (firebase-admin이 FIREBASE_AUTH_EMULATOR_HOST로 호출) ----
+    @app.post("/identitytoolkit.googleapis.com/v1/projects/{project_id}/accounts:lookup")
+    async def accounts_lookup(project_id: str, request: Request):
+        body = await request.json()
+        await begin("firebase")
+        if state.should_fail("firebase"):
+            return error("firebase", {"error": {"code": 500, "message": "INTERNAL_ERROR"}})
+        users = []
+        for uid in body.get("localId", []):
+            recorded = state.recorded("firebase", uid)
+            if recorded is not None:
+                users.append(recorded["response"])
+                continue
+            now_ms = str(int(time.time() * 1000))
+            users.append({
+                "localId": uid,
+                "email": f"{uid}@example.com",
+                "displayName": f"User {uid}",
+                "photoUrl": f"https://example.com/{uid}.png",
+                "emailVerified": True,
+                "disabled": False,
+                "createdAt": now_ms,
+                "lastLoginAt": now_ms,
+                "providerUserInfo": []
+            })
+        return {"kind": "identitytoolkit#GetAccountInfoResponse", "users": users}
+
+    # ---- 대역 서버 관리 ----
+    @app.get("/stub/token")
+    async def stub_token(uid: str = "loadtest-user", project_id: str = None):
+        """인증 라우트 부하 테스트용 ID 토큰 (백엔드는 FIREBASE_AUTH_EMULATOR_HOST 설정 필요)"""
+        project_id = project_id or os.getenv("FIREBASE_PROJECT_ID", "demo-roombot")
+        return {"id_token": make_emulator_token(uid, project_id)}
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        return {"counts": state.counts, "config": state.config, "replay_entries": len(state.replay)}
+
+    @app.post("/stub/config")
+    async def stub_config(request: Request):
+        """실행 중에 설정 변경 (예: {"etri": {"error_rate": 0.1}})"""
+        state.update(await request.json())
+        return state.config
+
+    @app.post("/stub/reset")
+    async def stub_reset():
+        state.counts.clear()
+        return {"ok": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI/ETRI/Google/Firebase 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--config", help="서비스별 설정 JSON (DEFAULT_CONFIG에 덮어씀)")
+    parser.add_argument("--replay", help="녹화된 응답 JSONL")
+    parser.add_argument("--seed", type=int, help="지연/오류 난수 시드 (재현용)")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    replay = load_replay(args.replay) if args.replay else None
+    state = StubState(config, replay, args.seed)
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()